@@ -4,6 +4,7 @@ Configuration module for movie character skill
 
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
 
 # Default directory names (relative to skill directory)
@@ -13,6 +14,16 @@ DEFAULT_OUTPUT_DIR = "output"
 DEFAULT_LOGS_DIR = "logs"
 
 
+def _index_by_name_or_id(items):
+    """Map each item's name and id to the item; the first item wins, as in a linear scan"""
+    index = {}
+    for item in items or ():
+        for key in (item.get('name'), item.get('id')):
+            if key is not None:
+                index.setdefault(key, item)
+    return index
+
+
 class Config:
     """Configuration manager for skill
 
@@ -119,6 +130,13 @@ class Config:
                     }
                 if "generation" not in config:
                     config["generation"] = self._get_default_generation_config()
+                else:
+                    # Add settings introduced after the file was written, so `config --set` can change them
+                    for key, value in self._get_default_generation_config().items():
+                        config["generation"].setdefault(key, value)
+                ui_config = config.setdefault("ui", {})
+                for key, value in self._get_default_ui_config().items():
+                    ui_config.setdefault(key, value)
 
                 # Save updated config if fields were added
                 self._save_config(config)
@@ -135,6 +153,7 @@ class Config:
                 "logs_dir": DEFAULT_LOGS_DIR
             },
             "generation": self._get_default_generation_config(),
+            "ui": self._get_default_ui_config(),
             "characters": []
         }
 
@@ -155,7 +174,15 @@ class Config:
             "max_image_count": 10,
             "image_width": 1440,
             "image_height": 2560,
-            "image_model": "doubao-seedream-4-5-251128"
+            "image_model": "doubao-seedream-4-5-251128",
+            "max_concurrent": 4,
+            "reuse_results": False
+        }
+
+    def _get_default_ui_config(self) -> dict:
+        """Get default interactive UI configuration"""
+        return {
+            "char_list_preview": 10
         }
 
     def _load_default_characters(self):
@@ -170,6 +197,7 @@ class Config:
         # Return empty list if file doesn't exist or is invalid
         return []
 
+    @lru_cache(maxsize=None)
     def get_all_scenarios(self):
         """Get all available scenarios from scenarios.json"""
         scenarios_config_file = self.skill_dir / "data" / self.config.get("scenarios", {}).get("config_file", "scenarios.json")
@@ -202,6 +230,7 @@ class Config:
                 "data_file": "default_characters.json"
             }]
 
+    @lru_cache(maxsize=None)
     def get_scenario(self, scenario_id):
         """Get a specific scenario by ID"""
         scenarios = self.get_all_scenarios()
@@ -210,6 +239,7 @@ class Config:
                 return scenario
         return None
 
+    @lru_cache(maxsize=None)
     def get_scenario_data(self, scenario_id):
         """Get scenario data file content (styles, poses, templates, or characters)"""
         scenario = self.get_scenario(scenario_id)
@@ -242,6 +272,12 @@ class Config:
         except (json.JSONDecodeError, IOError):
             return None
 
+    @lru_cache(maxsize=None)
+    def get_scenario_index(self, scenario_id):
+        """Get scenario data items keyed by both name and id"""
+        return _index_by_name_or_id(self.get_scenario_data(scenario_id))
+
+    @lru_cache(maxsize=None)
     def get_backgrounds(self, scenario_id):
         """Get background options for a scenario"""
         data_file = None
@@ -262,6 +298,18 @@ class Config:
         except (json.JSONDecodeError, IOError):
             return None
 
+    @lru_cache(maxsize=None)
+    def get_backgrounds_index(self, scenario_id):
+        """Get background options keyed by both name and id"""
+        return _index_by_name_or_id(self.get_backgrounds(scenario_id))
+
+    def cache_clear(self):
+        """Drop memoized scenario lookups so data files are re-read on next access"""
+        for getter in (Config.get_all_scenarios, Config.get_scenario,
+                       Config.get_scenario_data, Config.get_scenario_index,
+                       Config.get_backgrounds, Config.get_backgrounds_index):
+            getter.cache_clear()
+
     def _save_config(self, config=None):
         """Save configuration to file"""
         config = config or self.config
@@ -299,6 +347,7 @@ class Config:
         if section in self.config and key in self.config[section]:
             self.config[section][key] = value
             self._save_config()
+            self.cache_clear()
             return True
         return False
 
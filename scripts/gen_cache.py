@@ -0,0 +1,87 @@
+"""
+On-disk cache of generated images, keyed by input photos and generation parameters
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+CACHE_FILE_NAME = "generation_cache.json"
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=64)
+def _hash_file(path: str, mtime_ns: int, size: int) -> bytes:
+    """Stream the file through blake2b; mtime/size are part of the memo key so edits rehash"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.digest()
+
+
+def file_digest(path: str) -> bytes:
+    """Content digest of path, computed once per unchanged file"""
+    st = os.stat(path)
+    return _hash_file(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+class GenerationCache:
+    """Maps H(photo bytes + scenario + parameters) to previously generated image paths
+
+    Output file names are reused across runs, so each path is stored with the
+    digest of the image it held. An entry is only returned while every image
+    still exists with that content; deleting or overwriting an output turns
+    the next lookup into a miss.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_file = Path(cache_dir) / CACHE_FILE_NAME
+        self._index = None  # Loaded lazily by _load()
+
+    def _load(self) -> Dict[str, List[List[str]]]:
+        """Read the index file once per instance; a missing or corrupt file is an empty cache"""
+        if self._index is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def key(self, photos: Sequence[str], scenario_id: str, params: Dict) -> str:
+        """Build the cache key from the photo contents and the generation parameters"""
+        h = hashlib.blake2b()
+        for photo in photos:
+            h.update(file_digest(photo))
+        h.update(scenario_id.encode('utf-8'))
+        h.update(json.dumps(params, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    def hit(self, key: str) -> Optional[List[str]]:
+        """Return the cached image paths for key, or None if any of them is gone or changed"""
+        entries = self._load().get(key)
+        if not entries:
+            return None
+        paths = []
+        for path, digest in entries:
+            try:
+                if file_digest(path).hex() != digest:
+                    return None
+            except OSError:
+                return None
+            paths.append(path)
+        return paths
+
+    def store(self, key: str, paths: Sequence[str]):
+        """Remember the generated images for key (atomically rewrites the index file)"""
+        index = self._load()
+        index[key] = [[os.path.abspath(p), file_digest(p).hex()] for p in paths]
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
@@ -7,19 +7,72 @@ import json
 import base64
 import time
 import os
+import sys
+import logging
+import threading
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional
 import cv2
 import numpy as np
 
+# Works both as part of the scripts package and with scripts/ on sys.path (main.py)
+try:
+    from .prompt_defaults import (
+        LOGGER_NAME, SEPARATOR,
+        SERIES_SEASONS, SERIES_DEFAULT_STATES, SERIES_STORY_STAGES,
+        PHOTO_REFERENCE_DEFAULTS, fusion_person_instructions
+    )
+except ImportError:
+    from prompt_defaults import (
+        LOGGER_NAME, SEPARATOR,
+        SERIES_SEASONS, SERIES_DEFAULT_STATES, SERIES_STORY_STAGES,
+        PHOTO_REFERENCE_DEFAULTS, fusion_person_instructions
+    )
+
+# Banners and summaries go to stdout through the package logger only, so
+# they show up without logging.basicConfig and the root logger is untouched
+logger = logging.getLogger(LOGGER_NAME)
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.propagate = False
+if logger.level == logging.NOTSET:
+    logger.setLevel(logging.INFO)
+
+# Chunk size used when streaming downloaded images to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of pooled keep-alive connections per host
+HTTP_POOL_SIZE = 8
+
+# Minimum spacing (seconds) between the starts of consecutive API requests
+REQUEST_INTERVAL = 2
+
+# Default number of character images generated at once (generation.max_concurrent)
+DEFAULT_MAX_CONCURRENT = 4
+
+# Negative prompt used when the caller does not supply one
+DEFAULT_NEGATIVE_PROMPT = (
+    "blurry, distorted faces, unnatural pose, bad proportions, "
+    "watermark, text, low quality, artifacts, deformed hands, extra fingers"
+)
+
 class ImageGenerator:
     """Handles image generation using Seedream 4.5 API with updated format"""
 
     def __init__(self, config, interaction_manager):
         self.config = config
         self.interaction = interaction_manager
+        self._log = logger
         self.api_key = config.get_api_key()  # Uses API credentials from environment
         self.api_url = config.config["api"]["image_generation_url"]
+        self._session = None  # Created lazily by _get_session()
+        self._preprocessed = {}  # output path -> cache key of the source photo written there
+        # 1 disables overlapping requests for rate-limited API accounts
+        self.max_concurrent = max(1, int(config.config.get("generation", {}).get("max_concurrent", DEFAULT_MAX_CONCURRENT)))
 
         # Mock mode configuration
         self.mock_mode = os.getenv("MOCK_API", "false").lower() == "true"
@@ -34,6 +87,11 @@ class ImageGenerator:
         if self.mock_mode:
             print("🧪 MOCK MODE ENABLED - Using simulated API responses")
 
+    def _preprocess_cache_key(self, input_path: str) -> tuple:
+        """Identify a source photo by absolute path, mtime and size"""
+        stat = os.stat(input_path)
+        return (os.path.abspath(input_path), stat.st_mtime_ns, stat.st_size)
+
     def preprocess_user_photo(self, input_path: str) -> str:
         """
         Preprocess user photo: only resize to max 2048x2048 if larger.
@@ -43,6 +101,12 @@ class ImageGenerator:
         output_path = Path(self.config.config["paths"]["temp_dir"]) / "processed_user_photo.jpg"
 
         try:
+            # Skip the resize/encode if this exact source photo was already written here
+            cache_key = self._preprocess_cache_key(input_path)
+            if self._preprocessed.get(output_path) == cache_key and output_path.exists():
+                print(f"✅ Photo ready (cached): {output_path}")
+                return str(output_path)
+
             # Read image
             img = cv2.imread(input_path)
             if img is None:
@@ -64,6 +128,7 @@ class ImageGenerator:
 
             # Save processed image
             cv2.imwrite(str(output_path), img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            self._preprocessed[output_path] = cache_key
             print(f"✅ Photo ready: {output_path}")
             return str(output_path)
 
@@ -83,6 +148,12 @@ class ImageGenerator:
         output_path = Path(self.config.config["paths"]["temp_dir"]) / filename
 
         try:
+            # Skip the resize/encode if this exact source photo was already written here
+            cache_key = self._preprocess_cache_key(input_path)
+            if self._preprocessed.get(output_path) == cache_key and output_path.exists():
+                print(f"✅ Photo ready (cached): {output_path}")
+                return str(output_path)
+
             # Read image
             img = cv2.imread(input_path)
             if img is None:
@@ -104,6 +175,7 @@ class ImageGenerator:
 
             # Save processed image
             cv2.imwrite(str(output_path), img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            self._preprocessed[output_path] = cache_key
             print(f"✅ Photo ready: {output_path}")
             return str(output_path)
 
@@ -119,7 +191,68 @@ class ImageGenerator:
         base64_str = base64.b64encode(image_data).decode('utf-8')
         return f"data:image/jpeg;base64,{base64_str}"
 
-    def generate_single_image(self, user_photo_path: str, character: Dict, index: int) -> Optional[str]:
+    def _get_session(self) -> requests.Session:
+        """
+        Get the shared HTTP session, creating it on first use.
+        Reusing one pooled session keeps TCP+TLS connections alive across requests.
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _log_banner(self, title: str):
+        """Log a section banner; skipped entirely when INFO logging is disabled"""
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("\n%s\n%s\n%s", SEPARATOR, title, SEPARATOR)
+
+    def _log_summary(self, generated: str, failed: Optional[List[str]] = None):
+        """Log the generation summary as one pre-joined message"""
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info(
+                "\n%s\n📊 Generation Summary\n%s\n✅ Successfully generated: %s",
+                SEPARATOR, SEPARATOR, generated
+            )
+        if failed:
+            self._log.warning("❌ Failed for: %s", ", ".join(failed))
+
+    def _write_chunks(self, output_path: Path, chunks):
+        """
+        Write byte chunks with raw os.write calls (no Python-side buffering),
+        looping on short writes. A partial file is removed if anything fails.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(output_path, flags, 0o644)
+        try:
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+        except BaseException:
+            os.close(fd)
+            os.unlink(output_path)
+            raise
+        os.close(fd)
+
+    def _write_image_bytes(self, output_path: Path, image_bytes: bytes):
+        """Write decoded image bytes in one pass"""
+        self._write_chunks(output_path, (image_bytes,))
+
+    def _download_image(self, image_url: str, output_path: Path):
+        """Stream an image URL to disk in 1 MB chunks; a failed download leaves no file behind"""
+        with self._get_session().get(image_url, timeout=60, stream=True) as img_response:
+            img_response.raise_for_status()
+            self._write_chunks(output_path, img_response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+
+    def generate_single_image(self, user_photo_path: str, character: Dict, index: int,
+                              show_progress: bool = True) -> Optional[str]:
         """
         Generate a single image with the given character using Seedream 4.5 API
         """
@@ -156,10 +289,7 @@ class ImageGenerator:
             "prompt": full_prompt,
             "image": user_image_base64,  # Base64 encoded image
             "size": size_str,
-            "negative_prompt": (
-                "blurry, distorted faces, unnatural pose, bad proportions, "
-                "watermark, text, low quality, artifacts, deformed hands, extra fingers"
-            ),
+            "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
             "sequential_image_generation": "disabled",  # Generate single image
             "response_format": "b64_json",  # Get base64 response
             "watermark": False,  # No watermark
@@ -177,14 +307,14 @@ class ImageGenerator:
 
         try:
             # Show progress if image_count is set
-            if "image_count" in self.interaction.current_state:
+            if show_progress and "image_count" in self.interaction.current_state:
                 self.interaction.show_progress(
                     f"Generating with {character['name']}",
                     index,
                     self.interaction.current_state["image_count"]
                 )
 
-            response = requests.post(
+            response = self._get_session().post(
                 self.api_url,
                 headers=headers,
                 json=payload,
@@ -216,8 +346,7 @@ class ImageGenerator:
                     filename = f"photo_with_{character['name'].replace(' ', '_')}_{index:03d}.jpg"
                     output_path = self.image_dir / filename
 
-                    with open(output_path, "wb") as f:
-                        f.write(image_bytes)
+                    self._write_image_bytes(output_path, image_bytes)
 
                     print(f"\n✅ Generated: {filename}")
 
@@ -237,11 +366,7 @@ class ImageGenerator:
                     output_path = self.image_dir / filename
 
                     # Download image
-                    img_response = requests.get(image_url, timeout=60)
-                    img_response.raise_for_status()
-
-                    with open(output_path, "wb") as f:
-                        f.write(img_response.content)
+                    self._download_image(image_url, output_path)
 
                     print(f"\n✅ Generated and downloaded: {filename}")
 
@@ -268,47 +393,73 @@ class ImageGenerator:
             print(f"\n❌ Unexpected error for {character['name']}: {e}")
             return None
 
+    def generate_character_images(self, user_photo_path: str, characters: List[Dict]) -> List[Optional[str]]:
+        """
+        Generate one image per character, up to max_concurrent at a time.
+        Request starts stay REQUEST_INTERVAL seconds apart; results follow
+        character order, with None for each failed character.
+        An interrupt (Ctrl+C) stops any request that has not been sent yet.
+        """
+        if not characters:
+            return []
+
+        total = len(characters)
+        stop = threading.Event()
+        slot_lock = threading.Lock()
+        next_start = time.monotonic()
+
+        def reserve_start() -> float:
+            # Slots are handed out when a worker is ready to send, so workers
+            # freed at the same moment still start REQUEST_INTERVAL apart
+            nonlocal next_start
+            with slot_lock:
+                slot = max(time.monotonic(), next_start)
+                next_start = slot + REQUEST_INTERVAL
+            return slot
+
+        def generate(i: int, character: Dict) -> Optional[str]:
+            delay = reserve_start() - time.monotonic()
+            if stop.wait(delay) if delay > 0 else stop.is_set():
+                return None
+            print(f"\nGenerating image {i+1}/{total}: {character['name']}")
+            return self.generate_single_image(user_photo_path, character, i, show_progress=False)
+
+        results = [None] * total
+        pool = ThreadPoolExecutor(max_workers=min(self.max_concurrent, HTTP_POOL_SIZE, total))
+        try:
+            futures = {pool.submit(generate, i, character): i for i, character in enumerate(characters)}
+            # Progress is reported here, on the calling thread, as requests finish
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                self.interaction.show_progress("Generating character images", done, total)
+        except BaseException:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        return results
+
     def generate_all_images(self, user_photo_path: str, characters: List[Dict]) -> List[str]:
         """
         Generate images for all specified characters
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Image Generation Started")
-        print("=" * 60)
+        self._log_banner("🖼️  Image Generation Started")
 
         # Preprocess user photo
         processed_photo = self.preprocess_user_photo(user_photo_path)
 
-        generated_images = []
-        failed_characters = []
-
-        for i, character in enumerate(characters):
-            print(f"\nGenerating image {i+1}/{len(characters)}: {character['name']}")
+        results = self.generate_character_images(processed_photo, characters)
+        generated_images = [path for path in results if path]
+        failed_characters = [c['name'] for c, path in zip(characters, results) if not path]
 
-            image_path = self.generate_single_image(processed_photo, character, i)
-
-            if image_path:
-                generated_images.append(image_path)
-                # Update state
-                self.interaction.update_state("generated_images", generated_images)
-            else:
-                failed_characters.append(character['name'])
-
-            # Rate limiting - wait between requests
-            if i < len(characters) - 1:
-                time.sleep(2)
+        # Update state
+        self.interaction.update_state("generated_images", generated_images, persist=False)
 
         # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} images")
-        if failed_characters:
-            print(f"❌ Failed for: {', '.join(failed_characters)}")
+        self._log_summary(f"{len(generated_images)} images", failed_characters)
 
         # Update final state
-        self.interaction.current_state["image_order"] = generated_images.copy()
-        self.interaction._save_state()
+        self.interaction.update_state("image_order", generated_images.copy())
 
         return generated_images
 
@@ -316,9 +467,7 @@ class ImageGenerator:
         """
         Generate portrait images with different styles
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Portrait Generation Started")
-        print("=" * 60)
+        self._log_banner("🖼️  Portrait Generation Started")
 
         # Ensure count is valid
         if count is None:
@@ -368,7 +517,7 @@ class ImageGenerator:
 
             if image_path:
                 generated_images.append(image_path)
-                self.interaction.update_state("generated_images", generated_images)
+                self.interaction.update_state("generated_images", generated_images, persist=False)
             else:
                 failed_styles.append(style['name'])
 
@@ -377,15 +526,9 @@ class ImageGenerator:
                 time.sleep(2)
 
         # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} portraits")
-        if failed_styles:
-            print(f"❌ Failed for: {', '.join(failed_styles)}")
+        self._log_summary(f"{len(generated_images)} portraits", failed_styles)
 
-        self.interaction.current_state["image_order"] = generated_images.copy()
-        self.interaction._save_state()
+        self.interaction.update_state("image_order", generated_images.copy())
 
         return generated_images
 
@@ -393,9 +536,7 @@ class ImageGenerator:
         """
         Generate couple portrait images
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Couple Portrait Generation Started")
-        print("=" * 60)
+        self._log_banner("🖼️  Couple Portrait Generation Started")
 
         # Preprocess photos with unique filenames
         processed_photos = []
@@ -452,7 +593,7 @@ class ImageGenerator:
 
             if image_path:
                 generated_images.append(image_path)
-                self.interaction.update_state("generated_images", generated_images)
+                self.interaction.update_state("generated_images", generated_images, persist=False)
             else:
                 failed_generations.append(str(i+1))
 
@@ -461,15 +602,9 @@ class ImageGenerator:
                 time.sleep(2)
 
         # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} couple portraits")
-        if failed_generations:
-            print(f"❌ Failed for: {', '.join(failed_generations)}")
+        self._log_summary(f"{len(generated_images)} couple portraits", failed_generations)
 
-        self.interaction.current_state["image_order"] = generated_images.copy()
-        self.interaction._save_state()
+        self.interaction.update_state("image_order", generated_images.copy())
 
         return generated_images
 
@@ -477,9 +612,7 @@ class ImageGenerator:
         """
         Generate family portrait images
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Family Portrait Generation Started")
-        print("=" * 60)
+        self._log_banner("🖼️  Family Portrait Generation Started")
 
         # Use provided template or get default
         if family_template is None:
@@ -568,7 +701,7 @@ class ImageGenerator:
 
             if image_path:
                 generated_images.append(image_path)
-                self.interaction.update_state("generated_images", generated_images)
+                self.interaction.update_state("generated_images", generated_images, persist=False)
             else:
                 failed_generations.append(str(i+1))
 
@@ -577,15 +710,9 @@ class ImageGenerator:
                 time.sleep(2)
 
         # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} family portraits")
-        if failed_generations:
-            print(f"❌ Failed for: {', '.join(failed_generations)}")
+        self._log_summary(f"{len(generated_images)} family portraits", failed_generations)
 
-        self.interaction.current_state["image_order"] = generated_images.copy()
-        self.interaction._save_state()
+        self.interaction.update_state("image_order", generated_images.copy())
 
         return generated_images
 
@@ -610,10 +737,7 @@ class ImageGenerator:
             "prompt": prompt,
             "image": user_image_base64,
             "size": size_str,
-            "negative_prompt": (
-                "blurry, distorted faces, unnatural pose, bad proportions, "
-                "watermark, text, low quality, artifacts, deformed hands, extra fingers"
-            ),
+            "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
             "sequential_image_generation": "disabled",
             "response_format": "b64_json",
             "watermark": False
@@ -642,10 +766,7 @@ class ImageGenerator:
             "prompt": prompt,
             "image": images_base64,  # Array of base64 images
             "size": size_str,
-            "negative_prompt": (
-                "blurry, distorted faces, unnatural pose, bad proportions, "
-                "watermark, text, low quality, artifacts, deformed hands, extra fingers"
-            ),
+            "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
             "sequential_image_generation": "disabled",
             "response_format": "b64_json",
             "watermark": False
@@ -667,10 +788,7 @@ class ImageGenerator:
             "model": gen_config.get("image_model", "doubao-seedream-4-5-251128"),
             "prompt": prompt,
             "size": size_str,
-            "negative_prompt": (
-                "blurry, distorted faces, unnatural pose, bad proportions, "
-                "watermark, text, low quality, artifacts, deformed hands, extra fingers"
-            ),
+            "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
             "sequential_image_generation": "disabled",
             "response_format": "b64_json",
             "watermark": False
@@ -690,7 +808,7 @@ class ImageGenerator:
         }
 
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 self.api_url,
                 headers=headers,
                 json=payload,
@@ -717,8 +835,7 @@ class ImageGenerator:
                     image_bytes = base64.b64decode(image_data["b64_json"])
                     output_path = self.image_dir / f"{filename}.jpg"
 
-                    with open(output_path, "wb") as f:
-                        f.write(image_bytes)
+                    self._write_image_bytes(output_path, image_bytes)
 
                     print(f"\n✅ Generated: {filename}.jpg")
 
@@ -732,11 +849,7 @@ class ImageGenerator:
                     image_url = image_data["url"]
                     output_path = self.image_dir / f"{filename}.jpg"
 
-                    img_response = requests.get(image_url, timeout=60)
-                    img_response.raise_for_status()
-
-                    with open(output_path, "wb") as f:
-                        f.write(img_response.content)
+                    self._download_image(image_url, output_path)
 
                     print(f"\n✅ Generated and downloaded: {filename}.jpg")
 
@@ -885,9 +998,7 @@ class ImageGenerator:
         Returns:
             List of generated image paths
         """
-        print("\n" + "=" * 60)
-        print("🎨 Free Mode Generation Started")
-        print("=" * 60)
+        self._log_banner("🎨 Free Mode Generation Started")
 
         # Validate photo count
         if not photos:
@@ -898,8 +1009,8 @@ class ImageGenerator:
             print(f"⚠️ Maximum 14 photos allowed, using first 14")
             photos = photos[:14]
 
-        print(f"📸 Processing {len(photos)} reference photo(s)")
-        print(f"📝 Custom prompt: {prompt[:100]}...")
+        self._log.info("📸 Processing %d reference photo(s)", len(photos))
+        self._log.info("📝 Custom prompt: %s...", prompt[:100])
 
         # Preprocess all photos with unique filenames
         processed_photos = []
@@ -927,7 +1038,7 @@ class ImageGenerator:
 
             if image_path:
                 generated_images.append(image_path)
-                self.interaction.update_state("generated_images", generated_images)
+                self.interaction.update_state("generated_images", generated_images, persist=False)
             else:
                 failed_generations.append(str(i+1))
 
@@ -936,15 +1047,9 @@ class ImageGenerator:
                 time.sleep(2)
 
         # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} images")
-        if failed_generations:
-            print(f"❌ Failed for: {', '.join(failed_generations)}")
+        self._log_summary(f"{len(generated_images)} images", failed_generations)
 
-        self.interaction.current_state["image_order"] = generated_images.copy()
-        self.interaction._save_state()
+        self.interaction.update_state("image_order", generated_images.copy())
 
         return generated_images
 
@@ -963,10 +1068,7 @@ class ImageGenerator:
         if photo_count == 1:
             person_instructions = "Use facial features, gender, age, and appearance from the reference photo."
         else:
-            person_instructions = " ".join([
-                f"Person {j+1}: Extract facial features, gender, age, and appearance from reference photo #{j+1} only."
-                for j in range(photo_count)
-            ])
+            person_instructions = fusion_person_instructions(photo_count)
 
         complete_prompt = (
             f"{user_prompt}\n\n"
@@ -1003,10 +1105,7 @@ class ImageGenerator:
             "prompt": prompt,
             "image": images_base64,  # Array of base64 images
             "size": size_str,
-            "negative_prompt": negative_prompt if negative_prompt else (
-                "blurry, distorted faces, unnatural pose, bad proportions, "
-                "watermark, text, low quality, artifacts, deformed hands, extra fingers"
-            ),
+            "negative_prompt": negative_prompt or DEFAULT_NEGATIVE_PROMPT,
             "sequential_image_generation": "disabled",
             "response_format": "b64_json",
             "watermark": False
@@ -1026,19 +1125,15 @@ class ImageGenerator:
         Returns:
             List of generated image paths
         """
-        print("\n" + "=" * 60)
-        print("✏️  Image Edit Generation Started")
-        print("=" * 60)
+        self._log_banner("✏️  Image Edit Generation Started")
 
         processed_photo = self.preprocess_user_photo(photo)
 
         prompt_structure = template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
-        field_values_with_default.update(field_values)
-        full_prompt = prompt_structure.format(**field_values_with_default)
+        full_prompt = prompt_structure.format_map(ChainMap(field_values, PHOTO_REFERENCE_DEFAULTS))
 
-        print(f"  Template: {template['name']}")
-        print(f"  Prompt preview: {full_prompt[:100]}...")
+        self._log.info("  Template: %s", template['name'])
+        self._log.info("  Prompt preview: %s...", full_prompt[:100])
 
         image_path = self._generate_with_single_photo(
             processed_photo,
@@ -1049,15 +1144,11 @@ class ImageGenerator:
 
         if image_path:
             generated_images = [image_path]
-            self.interaction.update_state("generated_images", generated_images)
+            self.interaction.update_state("generated_images", generated_images, persist=False)
 
-            print("\n" + "=" * 60)
-            print("📊 Generation Summary")
-            print("=" * 60)
-            print(f"✅ Successfully generated: {len(generated_images)} image(s)")
+            self._log_summary(f"{len(generated_images)} image(s)")
 
-            self.interaction.current_state["image_order"] = generated_images.copy()
-            self.interaction._save_state()
+            self.interaction.update_state("image_order", generated_images.copy())
 
             return generated_images
         else:
@@ -1076,9 +1167,7 @@ class ImageGenerator:
         Returns:
             List of generated image paths
         """
-        print("\n" + "=" * 60)
-        print("🔀 Fusion Generation Started")
-        print("=" * 60)
+        self._log_banner("🔀 Fusion Generation Started")
 
         processed_photos = []
         for i, photo in enumerate(photos):
@@ -1087,20 +1176,14 @@ class ImageGenerator:
 
         prompt_structure = template.get("prompt_structure", "")
         photo_count = len(photos)
-        person_instructions = " ".join([
-            f"Person {j+1}: Extract facial features, gender, age, and appearance from reference photo #{j+1} only."
-            for j in range(photo_count)
-        ])
-        field_values_with_default = {
+        full_prompt = prompt_structure.format_map(ChainMap(field_values, {
             "photo_count": photo_count,
-            "person_instructions": person_instructions
-        }
-        field_values_with_default.update(field_values)
-        full_prompt = prompt_structure.format(**field_values_with_default)
+            "person_instructions": fusion_person_instructions(photo_count)
+        }))
 
-        print(f"  Template: {template['name']}")
-        print(f"  Reference photos: {photo_count}")
-        print(f"  Prompt preview: {full_prompt[:100]}...")
+        self._log.info("  Template: %s", template['name'])
+        self._log.info("  Reference photos: %d", photo_count)
+        self._log.info("  Prompt preview: %s...", full_prompt[:100])
 
         image_path = self._generate_with_multiple_photos(
             processed_photos,
@@ -1111,15 +1194,11 @@ class ImageGenerator:
 
         if image_path:
             generated_images = [image_path]
-            self.interaction.update_state("generated_images", generated_images)
+            self.interaction.update_state("generated_images", generated_images, persist=False)
 
-            print("\n" + "=" * 60)
-            print("📊 Generation Summary")
-            print("=" * 60)
-            print(f"✅ Successfully generated: {len(generated_images)} image(s)")
+            self._log_summary(f"{len(generated_images)} image(s)")
 
-            self.interaction.current_state["image_order"] = generated_images.copy()
-            self.interaction._save_state()
+            self.interaction.update_state("image_order", generated_images.copy())
 
             return generated_images
         else:
@@ -1138,58 +1217,41 @@ class ImageGenerator:
         Returns:
             List of generated image paths
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Series Generation Started")
-        print("=" * 60)
+        self._log_banner("🖼️  Series Generation Started")
 
         processed_photo = self.preprocess_user_photo(photo)
 
         prompt_structure = template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
-        field_values_with_default.update(field_values)
+        series_values = {}  # Derived placeholders; these take precedence over field values
 
         template_id = template.get('id', '')
         if template_id == 'seasons':
             count = field_values.get('count', 4)
             scene_instructions = f"场景统一为：{field_values.get('scene', '户外庭院')}。"
 
-            seasonal_descriptions = "\n各季节描述：\n"
-            seasons = [
-                ("春天", "嫩绿新叶，粉红花朵，柔和晨光，生机勃勃"),
-                ("夏天", "翠绿浓荫，金色阳光，强烈日光，热情洋溢"),
-                ("秋天", "橙红落叶，金黄果实，温暖黄昏，丰收喜悦"),
-                ("冬天", "银白雪地，深蓝天空，冷清冬阳，静谧纯净")
-            ]
-            for i, (season, desc) in enumerate(seasons[:count]):
-                seasonal_descriptions += f"图片{i+1}：{season} - {desc}。\n"
+            seasonal_descriptions = "\n各季节描述：\n" + "".join(
+                f"图片{i+1}：{season} - {desc}。\n" for i, (season, desc) in enumerate(SERIES_SEASONS[:count])
+            )
 
-            field_values_with_default['count'] = count
-            field_values_with_default['scene_instructions'] = scene_instructions
-            field_values_with_default['seasonal_descriptions'] = seasonal_descriptions
+            series_values['count'] = count
+            series_values['scene_instructions'] = scene_instructions
+            series_values['seasonal_descriptions'] = seasonal_descriptions
 
         elif template_id == 'character-states':
             count = field_values.get('count', 4)
             state_type = field_values.get('state_type', '动作状态')
             custom_states = field_values.get('custom_states', '')
 
-            state_descriptions = "\n各状态描述：\n"
             if custom_states:
-                states = custom_states.split('、')
-                for i, state in enumerate(states[:count]):
-                    state_descriptions += f"图片{i+1}：{state.strip()}。\n"
+                states = [state.strip() for state in custom_states.split('、')]
             else:
-                default_states = {
-                    "动作状态": ["奔跑", "跳跃", "静止", "转身"],
-                    "表情状态": ["开心", "惊讶", "思考", "平静"],
-                    "服装变化": ["日常装", "运动装", "正式装", "休闲装"],
-                    "道具互动": ["手持相机", "抱着玩偶", "拿着书本", "背着背包"]
-                }
-                states = default_states.get(state_type, default_states["动作状态"])
-                for i, state in enumerate(states[:count]):
-                    state_descriptions += f"图片{i+1}：{state}。\n"
-
-            field_values_with_default['count'] = count
-            field_values_with_default['state_descriptions'] = state_descriptions
+                states = SERIES_DEFAULT_STATES.get(state_type, SERIES_DEFAULT_STATES["动作状态"])
+            state_descriptions = "\n各状态描述：\n" + "".join(
+                f"图片{i+1}：{state}。\n" for i, state in enumerate(states[:count])
+            )
+
+            series_values['count'] = count
+            series_values['state_descriptions'] = state_descriptions
 
         elif template_id == 'story-sequence':
             count = field_values.get('count', 6)
@@ -1197,27 +1259,19 @@ class ImageGenerator:
 
             story_outline = f"故事大纲：{theme}。"
 
-            scene_descriptions = "\n场景描述：\n"
-            scene_stages = [
-                "故事开端，介绍主角和初始环境",
-                "发展情节，主角面临挑战或机会",
-                "情节升级，主角采取行动或做出选择",
-                "高潮时刻，关键冲突或转折点",
-                "解决阶段，主角克服困难或达成目标",
-                "结局，展示结果和成长"
-            ]
-            for i in range(min(count, len(scene_stages))):
-                scene_descriptions += f"图片{i+1}：{scene_stages[i]}。\n"
-
-            field_values_with_default['count'] = count
-            field_values_with_default['story_outline'] = story_outline
-            field_values_with_default['scene_descriptions'] = scene_descriptions
+            scene_descriptions = "\n场景描述：\n" + "".join(
+                f"图片{i+1}：{stage}。\n" for i, stage in enumerate(SERIES_STORY_STAGES[:count])
+            )
 
-        full_prompt = prompt_structure.format(**field_values_with_default)
+            series_values['count'] = count
+            series_values['story_outline'] = story_outline
+            series_values['scene_descriptions'] = scene_descriptions
+
+        full_prompt = prompt_structure.format_map(ChainMap(series_values, field_values, PHOTO_REFERENCE_DEFAULTS))
 
-        print(f"  Template: {template['name']}")
-        print(f"  Image count: {field_values.get('count', 1)}")
-        print(f"  Prompt preview: {full_prompt[:150]}...")
+        self._log.info("  Template: %s", template['name'])
+        self._log.info("  Image count: %s", field_values.get('count', 1))
+        self._log.info("  Prompt preview: %s...", full_prompt[:150])
 
         image_path = self._generate_with_single_photo(
             processed_photo,
@@ -1228,15 +1282,11 @@ class ImageGenerator:
 
         if image_path:
             generated_images = [image_path]
-            self.interaction.update_state("generated_images", generated_images)
+            self.interaction.update_state("generated_images", generated_images, persist=False)
 
-            print("\n" + "=" * 60)
-            print("📊 Generation Summary")
-            print("=" * 60)
-            print(f"✅ Successfully generated: {len(generated_images)} image(s)")
+            self._log_summary(f"{len(generated_images)} image(s)")
 
-            self.interaction.current_state["image_order"] = generated_images.copy()
-            self.interaction._save_state()
+            self.interaction.update_state("image_order", generated_images.copy())
 
             return generated_images
         else:
@@ -1255,12 +1305,10 @@ class ImageGenerator:
         Returns:
             List of generated image paths
         """
-        print("\n" + "=" * 60)
-        print("📄 Poster Generation Started")
-        print("=" * 60)
+        self._log_banner("📄 Poster Generation Started")
 
         prompt_structure = template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
+        field_values_with_default = dict(PHOTO_REFERENCE_DEFAULTS)
 
         # Get all template fields and set defaults for missing ones
         template_fields = template.get('fields', [])
@@ -1281,9 +1329,9 @@ class ImageGenerator:
 
         full_prompt = prompt_structure.format(**field_values_with_default)
 
-        print(f"  Template: {template['name']}")
-        print(f"  Reference photo: {'Yes' if photo else 'No (text-only generation)'}")
-        print(f"  Prompt preview: {full_prompt[:150]}...")
+        self._log.info("  Template: %s", template['name'])
+        self._log.info("  Reference photo: %s", 'Yes' if photo else 'No (text-only generation)')
+        self._log.info("  Prompt preview: %s...", full_prompt[:150])
 
         if photo:
             processed_photo = self.preprocess_user_photo(photo)
@@ -1301,15 +1349,11 @@ class ImageGenerator:
 
         if image_path:
             generated_images = [image_path]
-            self.interaction.update_state("generated_images", generated_images)
+            self.interaction.update_state("generated_images", generated_images, persist=False)
 
-            print("\n" + "=" * 60)
-            print("📊 Generation Summary")
-            print("=" * 60)
-            print(f"✅ Successfully generated: {len(generated_images)} image(s)")
+            self._log_summary(f"{len(generated_images)} image(s)")
 
-            self.interaction.current_state["image_order"] = generated_images.copy()
-            self.interaction._save_state()
+            self.interaction.update_state("image_order", generated_images.copy())
 
             return generated_images
         else:
@@ -2,10 +2,129 @@
 Interaction module for collecting user input and managing the generation process
 """
 
+import atexit
 import json
+import os
 import sys
+from collections import ChainMap, deque
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional
+
+try:
+    import orjson
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+    JSONDecodeError = json.JSONDecodeError
+
+# Works both as part of the scripts package and with scripts/ on sys.path (main.py)
+try:
+    from .prompt_defaults import (
+        SEPARATOR, SEPARATOR_NL, SUB_SEPARATOR,
+        SERIES_SEASONS, SERIES_DEFAULT_STATES, SERIES_STORY_STAGES,
+        PHOTO_REFERENCE_DEFAULTS, fusion_person_instructions
+    )
+except ImportError:
+    from prompt_defaults import (
+        SEPARATOR, SEPARATOR_NL, SUB_SEPARATOR,
+        SERIES_SEASONS, SERIES_DEFAULT_STATES, SERIES_STORY_STAGES,
+        PHOTO_REFERENCE_DEFAULTS, fusion_person_instructions
+    )
+
+try:
+    import ijson
+    # Errors a character JSON file can raise, whichever parser reads it
+    JSON_FILE_ERRORS = (JSONDecodeError, ijson.JSONError)
+except ImportError:  # ijson is optional; character files are parsed in one go
+    ijson = None
+    JSON_FILE_ERRORS = (JSONDecodeError,)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes (uses orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str (uses orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Static option menus, each written to stdout in a single call
+CHARACTER_SELECTION_MENU = (
+    "\nOptions:\n"
+    "1. Use all available characters\n"
+    "2. Select specific characters\n"
+    "3. Let AI suggest characters based on your photo\n"
+    "4. Enter custom movie characters\n"
+)
+CUSTOM_CHARACTER_INPUT_MENU = (
+    "Options:\n"
+    "  1. Interactive input (one per line, format: Name|Description|Scene)\n"
+    "  2. JSON input (paste JSON array)\n"
+    "  3. Load from JSON file\n"
+)
+REVIEW_MENU = (
+    "\nOptions:\n"
+    "1. View image details\n"
+    "2. Reorder images\n"
+    "3. Regenerate specific image\n"
+    "4. Confirm and save photos\n"
+    "5. Cancel generation\n"
+)
+SCENARIO_HELP = (
+    "\n1. 图像编辑 - 换衣服、换材质、换背景等\n"
+    "2. 多图融合 - 穿搭融合、人景融合、品牌设计等\n"
+    "3. 自由模式 - 完全自定义的 prompt 生成\n"
+    "4. 个人写真 - 专业个人肖像摄影\n"
+    "5. 双人合影 - 情侣或朋友合影\n"
+    "6. 全家合影 - 家庭合照（3-6人）\n"
+    "7. 明星合影 - 与电影明星拍照留念\n"
+)
+
+# Every possible progress bar rendering, indexed by filled length
+PROGRESS_BAR_LENGTH = 40
+PROGRESS_BARS = tuple(
+    '█' * filled + '░' * (PROGRESS_BAR_LENGTH - filled)
+    for filled in range(PROGRESS_BAR_LENGTH + 1)
+)
+
+# Scene used for custom movie characters entered without one
+DEFAULT_CHARACTER_SCENE = "movie set with crew members working, cameras and equipment visible"
+
+
+def make_custom_character(name: str, prompt: Optional[str] = None,
+                          scene: str = DEFAULT_CHARACTER_SCENE) -> Dict:
+    """Build a custom movie character dict, filling in the default prompt and scene"""
+    if prompt is None:
+        prompt = f"{name} on film set, between takes, cinematic lighting"
+    return {"name": name, "prompt": prompt, "scene": scene}
+
+
+def parse_character_line(line: str) -> Dict:
+    """Parse a 'Name|Prompt|Scene' line (prompt and scene optional) into a custom character"""
+    return make_custom_character(*(part.strip() for part in line.split("|", 2)))
+
+
+# State keys collect_user_inputs() returns; all set means the wizard can be skipped
+RESUME_INPUT_KEYS = ("user_photo", "image_count", "selected_characters")
+
+
+def _emit(*lines: str) -> None:
+    """Write several lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _numbered(items) -> str:
+    """Format items as a 1-based numbered listing, one per line"""
+    return "".join(f"{i}. {item}\n" for i, item in enumerate(items, 1))
+
 
 class InteractionManager:
     """Manages user interaction for the generation process"""
@@ -14,15 +133,20 @@ class InteractionManager:
         self.config = config
         self.state_file = Path(config.skill_dir) / "temp" / "generation_state.json"
         self.current_state = self._load_state()
+        self._dirty = False  # State changed since the last write
+        self._buffer_depth = 0  # Nesting depth of buffered() blocks
+        self._batch_lines = None  # Pre-read stdin lines when stdin is not a terminal
+        self._image_sizes = {}  # File sizes shown on the review screen, by path
+        self._menus = {}  # Rendered menu listings, see _menu()
+        # Don't lose deferred (persist=False) updates if the run is interrupted
+        atexit.register(self.flush)
 
     def _load_state(self):
         """Load current generation state"""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                pass
+        try:
+            return _json_loads(self.state_file.read_bytes())
+        except (FileNotFoundError, JSONDecodeError):
+            pass
         return {
             "step": "initial",
             "user_photo": None,
@@ -34,19 +158,92 @@ class InteractionManager:
         }
 
     def _save_state(self):
-        """Save current generation state"""
+        """Save current generation state (atomically, so a crash never leaves a partial file)"""
         self.state_file.parent.mkdir(exist_ok=True)
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(self.current_state, f, indent=2, ensure_ascii=False)
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(_json_dumps(self.current_state))
+        os.replace(tmp_file, self.state_file)
+        self._dirty = False
+
+    def flush(self):
+        """Write the state file if it changed since the last write"""
+        if self._dirty:
+            self._save_state()
+
+    @contextmanager
+    def buffered(self):
+        """
+        Defer state writes until the outermost buffered block exits.
+        update_state() calls inside the block only mark the state dirty;
+        it is written once on exit if anything changed.
+        """
+        self._buffer_depth += 1
+        try:
+            yield self
+        finally:
+            self._buffer_depth -= 1
+            if self._buffer_depth == 0:
+                self.flush()
+
+    def _input(self, prompt: str = "") -> str:
+        """
+        Read one line of user input.
+        When stdin is not a terminal (scripted runs), all of stdin is read in a
+        single call on first use and later prompts are served from that batch.
+        """
+        if self._batch_lines is None:
+            if sys.stdin.isatty():
+                return input(prompt)
+            self._batch_lines = deque(sys.stdin.read().splitlines())
+        sys.stdout.write(prompt)
+        if not self._batch_lines:
+            raise EOFError("EOF when reading a line")
+        return self._batch_lines.popleft()
+
+    def _read_remaining_input(self) -> str:
+        """Read all remaining user input up to EOF"""
+        if self._batch_lines is not None:
+            remaining = "\n".join(self._batch_lines)
+            self._batch_lines.clear()
+            return remaining
+        return sys.stdin.read()
+
+    def _read_int(self, prompt: str, default: Optional[int] = None,
+                  lo: Optional[int] = None, hi: Optional[int] = None) -> Optional[int]:
+        """
+        Prompt for an integer.
+
+        Returns default for empty input, and None when the input is not an
+        integer or falls outside [lo, hi]. Callers decide how to report that.
+        """
+        text = self._input(prompt).strip()
+        if not text:
+            return default
+        digits = text[1:] if text[0] in "+-" else text
+        if not digits.isdecimal():
+            return None
+        value = int(text)
+        if (lo is not None and value < lo) or (hi is not None and value > hi):
+            return None
+        return value
+
+    def _menu(self, key, build) -> str:
+        """
+        Return the rendered menu listing for key, calling build() on first use.
+        Menus come from data files that do not change during a run, so each
+        one is formatted at most once per InteractionManager.
+        """
+        text = self._menus.get(key)
+        if text is None:
+            text = self._menus[key] = build()
+        return text
 
     def collect_scenario_selection(self):
         """
         Let user select which scenario to use
         Returns: selected scenario dict
         """
-        print("\n" + "============================================================")
-        print("📷 Photo Studio - Scenario Selection")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "📷 Photo Studio - Scenario Selection", SEPARATOR)
 
         scenarios = self.config.get_all_scenarios()
 
@@ -63,24 +260,19 @@ class InteractionManager:
             }
 
         print("\nAvailable Scenarios:")
-        for i, scenario in enumerate(scenarios, 1):
-            print(f"{i}. {scenario['name']}")
-            print(f"   {scenario['description']}")
-            print()
+        sys.stdout.write(self._menu("scenarios", lambda: "".join(
+            f"{i}. {scenario['name']}\n   {scenario['description']}\n\n"
+            for i, scenario in enumerate(scenarios, 1)
+        )))
 
         print("Select a scenario by number:")
-        try:
-            choice = int(input("> ").strip())
-            if 1 <= choice <= len(scenarios):
-                selected = scenarios[choice - 1]
-                print(f"\n✓ Selected: {selected['name']}")
-                return selected
-            else:
-                print("Invalid choice. Using first scenario.")
-                return scenarios[0]
-        except ValueError:
-            print("Invalid input. Using first scenario.")
+        choice = self._read_int("> ", lo=1, hi=len(scenarios))
+        if choice is None:
+            print("Invalid choice. Using first scenario.")
             return scenarios[0]
+        selected = scenarios[choice - 1]
+        print(f"\n✓ Selected: {selected['name']}")
+        return selected
 
     def collect_photos_for_scenario(self, scenario):
         """
@@ -91,35 +283,35 @@ class InteractionManager:
         required = scenario.get("required_photos", 1)
         max_photos = scenario.get("max_photos", 1)
 
-        print(f"\n{'=' * 60}")
-        print(f"📸 Photo Upload - {scenario['name']}")
-        print(f"{'=' * 60}")
-        print(f"Required photos: {required}")
-        print(f"Maximum photos: {max_photos}")
-        print()
+        _emit(
+            SEPARATOR_NL,
+            f"📸 Photo Upload - {scenario['name']}",
+            SEPARATOR,
+            f"Required photos: {required}",
+            f"Maximum photos: {max_photos}",
+            ""
+        )
 
         num_photos = required
         if max_photos > required:
             print(f"You may upload up to {max_photos} photos (default: {required})")
-            try:
-                custom_count = input(f"How many photos? (Press Enter for {required}): ").strip()
-                if custom_count:
-                    num_photos = int(custom_count)
-                    if num_photos < required:
-                        print(f"Minimum {required} photos required. Using {required}.")
-                        num_photos = required
-                    elif num_photos > max_photos:
-                        print(f"Maximum {max_photos} photos allowed. Using {max_photos}.")
-                        num_photos = max_photos
-            except ValueError:
+            num_photos = self._read_int(f"How many photos? (Press Enter for {required}): ", default=required)
+            if num_photos is None:
                 print(f"Invalid number. Using default: {required}")
+                num_photos = required
+            elif num_photos < required:
+                print(f"Minimum {required} photos required. Using {required}.")
+                num_photos = required
+            elif num_photos > max_photos:
+                print(f"Maximum {max_photos} photos allowed. Using {max_photos}.")
+                num_photos = max_photos
 
         for i in range(num_photos):
             while True:
-                photo_path = input(f"Photo {i+1}/{num_photos}: Enter photo path: ").strip()
-                if Path(photo_path).exists():
+                photo_path = self._input(f"Photo {i+1}/{num_photos}: Enter photo path: ").strip()
+                if os.path.isfile(photo_path):
                     photos.append(photo_path)
-                    print(f"  ✓ Added: {Path(photo_path).name}")
+                    print(f"  ✓ Added: {os.path.basename(photo_path)}")
                     break
                 else:
                     print(f"  ✗ File not found: {photo_path}")
@@ -131,9 +323,7 @@ class InteractionManager:
         """
         Collect inputs for portrait scenario
         """
-        print("\n" + "============================================================")
-        print("🎨 Portrait Photography Setup")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "🎨 Portrait Photography Setup", SEPARATOR)
 
         # Get photo
         photos = self.collect_photos_for_scenario(scenario)
@@ -143,14 +333,15 @@ class InteractionManager:
         styles = self.config.get_scenario_data(scenario["id"])
         if styles and len(styles) > 1:
             print("\nAvailable Portrait Styles:")
-            for i, style in enumerate(styles, 1):
-                print(f"{i}. {style['name']} ({style.get('category', 'Portrait')})")
-                print(f"   {style['prompt'][:80]}...")
-                print()
+            sys.stdout.write(self._menu(("styles", scenario["id"]), lambda: "".join(
+                f"{i}. {style['name']} ({style.get('category', 'Portrait')})\n"
+                f"   {style['prompt'][:80]}...\n\n"
+                for i, style in enumerate(styles, 1)
+            )))
 
             print("Select styles (comma-separated numbers, or 'all' for all):")
             try:
-                style_input = input("> ").strip().lower()
+                style_input = self._input("> ").strip().lower()
                 if style_input == "all":
                     selected_styles = styles
                 else:
@@ -177,9 +368,7 @@ class InteractionManager:
         """
         Collect inputs for couple scenario
         """
-        print("\n" + "============================================================")
-        print("👫 Couple Portrait Setup")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "👫 Couple Portrait Setup", SEPARATOR)
 
         # Get photos
         photos = self.collect_photos_for_scenario(scenario)
@@ -192,14 +381,8 @@ class InteractionManager:
             for i, t in enumerate(types, 1):
                 print(f"{i}. {t['name']}")
             print()
-            try:
-                type_idx = int(input("Select type: ").strip()) - 1
-                if 0 <= type_idx < len(types):
-                    inputs["couple_type"] = types[type_idx]
-                else:
-                    inputs["couple_type"] = types[0]
-            except ValueError:
-                inputs["couple_type"] = types[0]
+            type_choice = self._read_int("Select type: ", lo=1, hi=len(types))
+            inputs["couple_type"] = types[type_choice - 1] if type_choice else types[0]
         else:
             inputs["couple_type"] = types[0]
 
@@ -210,12 +393,8 @@ class InteractionManager:
 
         # Get image count
         print(f"\nHow many photos to generate? (default: 5, max: 10)")
-        try:
-            count_input = input("> ").strip()
-            count = int(count_input) if count_input else 5
-            inputs["image_count"] = max(1, min(count, 10))
-        except ValueError:
-            inputs["image_count"] = 5
+        count = self._read_int("> ", default=5)
+        inputs["image_count"] = max(1, min(count, 10)) if count is not None else 5
 
         return inputs
 
@@ -223,9 +402,7 @@ class InteractionManager:
         """
         Collect inputs for family scenario
         """
-        print("\n" + "============================================================")
-        print("👨‍👩‍👧‍👦 Family Portrait Setup")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "👨‍👩‍👧‍👦 Family Portrait Setup", SEPARATOR)
 
         # Get photos
         photos = self.collect_photos_for_scenario(scenario)
@@ -233,17 +410,15 @@ class InteractionManager:
 
         # Get person count
         print(f"\nHow many family members in total? (min: {len(photos)}, max: 6)")
-        try:
-            person_count_input = input("> ").strip()
-            person_count = int(person_count_input) if person_count_input else len(photos)
-            if person_count < len(photos):
-                print(f"Minimum {len(photos)} required. Using {len(photos)}.")
-                person_count = len(photos)
-            elif person_count > 6:
-                print(f"Maximum 6 allowed. Using 6.")
-                person_count = 6
-        except ValueError:
+        person_count = self._read_int("> ", default=len(photos))
+        if person_count is None:
             person_count = len(photos)
+        elif person_count < len(photos):
+            print(f"Minimum {len(photos)} required. Using {len(photos)}.")
+            person_count = len(photos)
+        elif person_count > 6:
+            print(f"Maximum 6 allowed. Using 6.")
+            person_count = 6
 
         inputs["person_count"] = person_count
 
@@ -254,12 +429,8 @@ class InteractionManager:
 
         # Get image count
         print(f"\nHow many photos to generate? (default: 5, max: 10)")
-        try:
-            count_input = input("> ").strip()
-            count = int(count_input) if count_input else 5
-            inputs["image_count"] = max(1, min(count, 10))
-        except ValueError:
-            inputs["image_count"] = 5
+        count = self._read_int("> ", default=5)
+        inputs["image_count"] = max(1, min(count, 10)) if count is not None else 5
 
         return inputs
 
@@ -268,22 +439,33 @@ class InteractionManager:
         Collect all necessary inputs from user through interactive prompts
         Returns: dictionary with collected inputs
         """
-        print("============================================================")
-        print("Movie Character Generation Wizard")
-        print("============================================================")
+        # Resuming with every step already answered: nothing to ask or re-save
+        state = self.current_state
+        if all(state.get(key) for key in RESUME_INPUT_KEYS):
+            if state.get("step") != "inputs_collected":
+                self.update_state("step", "inputs_collected")
+            print("Using previously collected inputs.")
+            return {key: state[key] for key in RESUME_INPUT_KEYS}
+
+        with self.buffered():
+            return self._collect_user_inputs()
+
+    def _collect_user_inputs(self):
+        """Body of collect_user_inputs; state changes are flushed by the caller"""
+        _emit(SEPARATOR, "Movie Character Generation Wizard", SEPARATOR)
 
         inputs = {}
 
         # Get user photo path
         if not self.current_state["user_photo"]:
             print("\n📷 Step 1: User Photo")
-            print("-" * 40)
-            photo_path = input("Please enter the path to your photo: ").strip()
-            if not Path(photo_path).exists():
+            print(SUB_SEPARATOR)
+            photo_path = self._input("Please enter the path to your photo: ").strip()
+            if not os.path.isfile(photo_path):
                 print(f"Error: File '{photo_path}' does not exist.")
                 return None
             inputs["user_photo"] = photo_path
-            self.current_state["user_photo"] = photo_path
+            self.update_state("user_photo", photo_path)
         else:
             inputs["user_photo"] = self.current_state["user_photo"]
             print(f"Using previously selected photo: {inputs['user_photo']}")
@@ -291,22 +473,18 @@ class InteractionManager:
         # Get number of images to generate
         if not self.current_state["image_count"]:
             print("\n🎬 Step 2: Number of Movie Characters")
-            print("-" * 40)
-            print(f"Default is {self.config.config['generation']['default_image_count']} characters.")
-            count_input = input("How many movie characters would you like to be with? (Press Enter for default): ").strip()
-            if count_input:
-                try:
-                    count = int(count_input)
-                    if count < 1 or count > 10:
-                        print("Please enter a number between 1 and 10. Using default.")
-                        count = self.config.config['generation']['default_image_count']
-                except ValueError:
-                    print("Invalid number. Using default.")
-                    count = self.config.config['generation']['default_image_count']
-            else:
-                count = self.config.config['generation']['default_image_count']
+            print(SUB_SEPARATOR)
+            default_count = self.config.config['generation']['default_image_count']
+            print(f"Default is {default_count} characters.")
+            count = self._read_int(
+                "How many movie characters would you like to be with? (Press Enter for default): ",
+                default=default_count, lo=1, hi=10
+            )
+            if count is None:
+                print("Please enter a number between 1 and 10. Using default.")
+                count = default_count
             inputs["image_count"] = count
-            self.current_state["image_count"] = count
+            self.update_state("image_count", count)
         else:
             inputs["image_count"] = self.current_state["image_count"]
             print(f"Using {inputs['image_count']} characters as previously selected.")
@@ -314,144 +492,119 @@ class InteractionManager:
         # Select characters
         if not self.current_state["selected_characters"]:
             print("\n🌟 Step 3: Select Movie Characters")
-            print("-" * 40)
+            print(SUB_SEPARATOR)
             characters = self.config.get_characters()
+            image_count = inputs["image_count"]
             print(f"Found {len(characters)} available characters.")
 
             # Show character list
-            for i, char in enumerate(characters, 1):
-                print(f"{i}. {char['name']}")
+            sys.stdout.write(self._menu("characters", lambda: _numbered(char['name'] for char in characters)))
 
-            print("\nOptions:")
-            print("1. Use all available characters")
-            print("2. Select specific characters")
-            print("3. Let AI suggest characters based on your photo")
-            print("4. Enter custom movie characters")
+            sys.stdout.write(CHARACTER_SELECTION_MENU)
 
-            choice = input("\nEnter your choice (1-4): ").strip()
+            choice = self._input("\nEnter your choice (1-4): ").strip()
 
             selected_chars = []
             if choice == "1":
                 # Use all characters (up to image_count)
-                selected_chars = characters[:inputs["image_count"]]
+                selected_chars = characters[:image_count]
                 print(f"Selected first {len(selected_chars)} characters.")
 
             elif choice == "2":
                 # Select specific characters
                 print("Enter the numbers of characters you want (comma-separated):")
-                char_indices = input("> ").strip()
+                char_indices = self._input("> ").strip()
                 try:
                     indices = [int(idx.strip()) - 1 for idx in char_indices.split(",")]
-                    indices = [idx for idx in indices if 0 <= idx < len(characters)]
-                    selected_chars = [characters[idx] for idx in indices[:inputs["image_count"]]]
+                    valid = range(len(characters))
+                    indices = [idx for idx in indices if idx in valid]
+                    selected_chars = [characters[idx] for idx in indices[:image_count]]
                 except ValueError:
                     print("Invalid input. Using first few characters.")
-                    selected_chars = characters[:inputs["image_count"]]
+                    selected_chars = characters[:image_count]
 
             elif choice == "3":
                 # AI suggested characters
                 print("AI will suggest characters based on your photo...")
                 # For now, use default characters
-                selected_chars = characters[:inputs["image_count"]]
+                selected_chars = characters[:image_count]
                 print(f"Selected: {', '.join([c['name'] for c in selected_chars])}")
 
             elif choice == "4":
                 # Custom characters
                 print("Enter custom movie characters:")
-                print("Options:")
-                print("  1. Interactive input (one per line, format: Name|Description|Scene)")
-                print("  2. JSON input (paste JSON array)")
-                print("  3. Load from JSON file")
+                sys.stdout.write(CUSTOM_CHARACTER_INPUT_MENU)
 
-                input_choice = input("\nChoose input method (1-3): ").strip()
+                input_choice = self._input("\nChoose input method (1-3): ").strip()
 
                 custom_chars = []
 
                 if input_choice == "1":
                     # Interactive input
-                    print("\nEnter characters (one per line, format: Name|Description|Scene)")
-                    print("Example: Batman|Bruce Wayne as Batman in dark knight suit|Gotham city at night")
-                    print("Scene is optional. Press Enter twice when done.")
-
-                    while len(custom_chars) < inputs["image_count"]:
-                        line = input(f"Character {len(custom_chars) + 1}: ").strip()
+                    _emit(
+                        "\nEnter characters (one per line, format: Name|Description|Scene)",
+                        "Example: Batman|Bruce Wayne as Batman in dark knight suit|Gotham city at night",
+                        "Scene is optional. Press Enter twice when done."
+                    )
+
+                    while len(custom_chars) < image_count:
+                        line = self._input(f"Character {len(custom_chars) + 1}: ").strip()
                         if not line:
                             if custom_chars:
                                 break
                             else:
                                 continue
 
-                        # Parse line
-                        parts = line.split("|")
-                        if len(parts) >= 2:
-                            name = parts[0].strip()
-                            prompt = parts[1].strip()
-                            scene = parts[2].strip() if len(parts) >= 3 else "movie set with crew members working, cameras and equipment visible"
-                            custom_chars.append({
-                                "name": name,
-                                "prompt": prompt,
-                                "scene": scene
-                            })
-                        else:
-                            # Just name provided
-                            custom_chars.append({
-                                "name": line.strip(),
-                                "prompt": f"{line.strip()} on film set, between takes, cinematic lighting",
-                                "scene": "movie set with crew members working, cameras and equipment visible"
-                            })
+                        custom_chars.append(parse_character_line(line))
 
                 elif input_choice == "2":
                     # JSON input
                     print("\nPaste JSON array of characters (format: [{\"name\": \"...\", \"prompt\": \"...\", \"scene\": \"...\"}, ...])")
                     print("Press Ctrl+D (Unix) or Ctrl+Z (Windows) then Enter when done:")
 
-                    import sys
                     json_input = ""
                     try:
-                        while True:
-                            line = sys.stdin.readline()
-                            if not line:
-                                break
-                            json_input += line
+                        # Read everything up to EOF in one call
+                        json_input = self._read_remaining_input()
                     except KeyboardInterrupt:
                         pass
 
                     if json_input.strip():
                         try:
-                            chars_from_json = json.loads(json_input)
+                            chars_from_json = _json_loads(json_input)
                             if isinstance(chars_from_json, list):
-                                for char in chars_from_json:
-                                    if isinstance(char, dict) and "name" in char:
-                                        custom_chars.append({
-                                            "name": char["name"],
-                                            "prompt": char.get("prompt", f"{char['name']} on film set"),
-                                            "scene": char.get("scene", "movie set with crew members working, cameras and equipment visible")
-                                        })
+                                custom_chars.extend(self._custom_characters_from_json(chars_from_json))
                                 print(f"✓ Loaded {len(custom_chars)} characters from JSON")
                             else:
                                 print("❌ JSON should be an array of objects")
-                        except json.JSONDecodeError as e:
+                        except JSONDecodeError as e:
                             print(f"❌ Invalid JSON: {e}")
 
                 elif input_choice == "3":
                     # Load from JSON file
-                    file_path = input("\nEnter path to JSON file: ").strip()
-                    if Path(file_path).exists():
+                    file_path = self._input("\nEnter path to JSON file: ").strip()
+                    if os.path.isfile(file_path):
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                chars_from_file = json.load(f)
-                            if isinstance(chars_from_file, list):
-                                for char in chars_from_file:
-                                    if isinstance(char, dict) and "name" in char:
-                                        custom_chars.append({
-                                            "name": char["name"],
-                                            "prompt": char.get("prompt", f"{char['name']} on film set"),
-                                            "scene": char.get("scene", "movie set with crew members working, cameras and equipment visible")
-                                        })
-                                print(f"✓ Loaded {len(custom_chars)} characters from file")
+                            if ijson is not None:
+                                # Stream the array and stop once enough characters are read
+                                with open(file_path, 'rb') as f:
+                                    loaded = list(islice(
+                                        self._custom_characters_from_json(ijson.items(f, 'item')),
+                                        image_count
+                                    ))
+                                custom_chars.extend(loaded)
+                                if custom_chars:
+                                    print(f"✓ Loaded {len(custom_chars)} characters from file")
+                                else:
+                                    print("❌ JSON should be an array of objects")
                             else:
-                                print("❌ JSON should be an array of objects")
-                        except json.JSONDecodeError as e:
+                                chars_from_file = _json_loads(Path(file_path).read_bytes())
+                                if isinstance(chars_from_file, list):
+                                    custom_chars.extend(self._custom_characters_from_json(chars_from_file))
+                                    print(f"✓ Loaded {len(custom_chars)} characters from file")
+                                else:
+                                    print("❌ JSON should be an array of objects")
+                        except JSON_FILE_ERRORS as e:
                             print(f"❌ Invalid JSON in file: {e}")
                         except Exception as e:
                             print(f"❌ Error reading file: {e}")
@@ -463,95 +616,88 @@ class InteractionManager:
                     print("Invalid choice. Using interactive input.")
                     # Fallback to simple input
                     print("\nEnter characters (one per line, format: Name|Description):")
-                    while len(custom_chars) < inputs["image_count"]:
-                        line = input(f"Character {len(custom_chars) + 1}: ").strip()
+                    while len(custom_chars) < image_count:
+                        line = self._input(f"Character {len(custom_chars) + 1}: ").strip()
                         if not line:
                             if custom_chars:
                                 break
                             else:
                                 continue
-                        if "|" in line:
-                            name, prompt = line.split("|", 1)
-                            custom_chars.append({
-                                "name": name.strip(),
-                                "prompt": prompt.strip(),
-                                "scene": "movie set with crew members working, cameras and equipment visible"
-                            })
-                        else:
-                            custom_chars.append({
-                                "name": line.strip(),
-                                "prompt": f"{line.strip()} on film set, between takes, cinematic lighting",
-                                "scene": "movie set with crew members working, cameras and equipment visible"
-                            })
+                        custom_chars.append(parse_character_line(line))
 
                 if not custom_chars:
                     print("No characters provided. Using default characters.")
-                    selected_chars = characters[:inputs["image_count"]]
+                    selected_chars = characters[:image_count]
                 else:
-                    selected_chars = custom_chars[:inputs["image_count"]]
+                    selected_chars = custom_chars[:image_count]
 
             else:
                 print("Invalid choice. Using default selection.")
-                selected_chars = characters[:inputs["image_count"]]
+                selected_chars = characters[:image_count]
 
             inputs["selected_characters"] = selected_chars
-            self.current_state["selected_characters"] = selected_chars
+            self.update_state("selected_characters", selected_chars)
         else:
             inputs["selected_characters"] = self.current_state["selected_characters"]
             print(f"Using previously selected {len(inputs['selected_characters'])} characters.")
 
-        # Save state
-        self.current_state["step"] = "inputs_collected"
-        self._save_state()
+        # Save state (written once when the buffered block exits)
+        self.update_state("step", "inputs_collected")
 
         print("\n✅ Input collection complete!")
         return inputs
 
+    def _custom_characters_from_json(self, chars: Iterable) -> Iterator[Dict]:
+        """Normalize parsed custom character JSON lazily, skipping entries without a name"""
+        return (
+            make_custom_character(
+                char["name"],
+                char.get("prompt", f"{char['name']} on film set"),
+                char.get("scene", DEFAULT_CHARACTER_SCENE)
+            )
+            for char in chars
+            if isinstance(char, dict) and "name" in char
+        )
+
     def show_generated_images(self, image_paths: List[str]):
         """
         Display generated images and allow user to review
         """
-        print("\n" + "============================================================")
-        print("📸 Generated Images Review")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "📸 Generated Images Review", SEPARATOR)
 
         if not image_paths:
             print("No images generated yet.")
             return False
 
+        # Basenames are shared by every listing on this screen
+        names = tuple(map(os.path.basename, image_paths))
+
         print(f"\nGenerated {len(image_paths)} images:")
-        for i, img_path in enumerate(image_paths, 1):
-            print(f"{i}. {Path(img_path).name}")
+        sys.stdout.write(_numbered(names))
 
-        print("\nOptions:")
-        print("1. View image details")
-        print("2. Reorder images")
-        print("3. Regenerate specific image")
-        print("4. Confirm and save photos")
-        print("5. Cancel generation")
+        sys.stdout.write(REVIEW_MENU)
 
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = self._input("\nEnter your choice (1-5): ").strip()
 
         if choice == "1":
             self._view_image_details(image_paths)
             return False
 
         elif choice == "2":
-            new_order = self._reorder_images(image_paths)
+            new_order = self._reorder_images(image_paths, names)
             if new_order:
-                self.current_state["image_order"] = new_order
-                self._save_state()
+                self.update_state("image_order", new_order)
                 print("Image order updated.")
             return False
 
         elif choice == "3":
-            self._regenerate_image(image_paths)
+            self._regenerate_image(image_paths, names)
             return False
 
         elif choice == "4":
-            self.current_state["confirmed"] = True
-            self.current_state["step"] = "images_confirmed"
-            self._save_state()
+            with self.buffered():
+                self.update_state("confirmed", True)
+                self.update_state("step", "images_confirmed")
             print("✅ Images confirmed! Photos saved.")
             return True
 
@@ -565,34 +711,39 @@ class InteractionManager:
 
     def _view_image_details(self, image_paths: List[str]):
         """Show detailed information about each image"""
-        for i, img_path in enumerate(image_paths, 1):
-            print(f"\n--- Image {i} ---")
-            print(f"Path: {img_path}")
-            print(f"Size: {Path(img_path).stat().st_size / 1024:.1f} KB")
-            # Here we could add image analysis or metadata display
-
-    def _reorder_images(self, image_paths: List[str]) -> List[str]:
-        """Allow user to reorder images"""
+        sizes = self._image_sizes
+        for img_path in image_paths:
+            if img_path not in sizes:
+                sizes[img_path] = os.path.getsize(img_path)
+        sys.stdout.write("".join(
+            f"\n--- Image {i} ---\n"
+            f"Path: {img_path}\n"
+            f"Size: {sizes[img_path] / 1024:.1f} KB\n"
+            for i, img_path in enumerate(image_paths, 1)
+        ))
+        # Here we could add image analysis or metadata display
+
+    def _reorder_images(self, image_paths: List[str], names) -> List[str]:
+        """Allow user to reorder images (names: precomputed basenames of image_paths)"""
         print("\nCurrent order:")
-        for i, img_path in enumerate(image_paths, 1):
-            print(f"{i}. {Path(img_path).name}")
+        sys.stdout.write(_numbered(names))
 
         print("\nEnter new order (comma-separated numbers):")
-        order_input = input("> ").strip()
+        order_input = self._input("> ").strip()
         try:
             new_indices = [int(idx.strip()) - 1 for idx in order_input.split(",")]
             # Validate indices
-            valid_indices = [idx for idx in new_indices if 0 <= idx < len(image_paths)]
+            valid = range(len(image_paths))
+            valid_indices = [idx for idx in new_indices if idx in valid]
             if len(valid_indices) != len(image_paths):
                 print("Invalid order. Must include all images.")
                 return image_paths
 
             new_order = [image_paths[idx] for idx in valid_indices]
             print("New order:")
-            for i, img_path in enumerate(new_order, 1):
-                print(f"{i}. {Path(img_path).name}")
+            sys.stdout.write(_numbered(names[idx] for idx in valid_indices))
 
-            confirm = input("\nConfirm new order? (y/n): ").strip().lower()
+            confirm = self._input("\nConfirm new order? (y/n): ").strip().lower()
             if confirm == 'y':
                 return new_order
             else:
@@ -602,64 +753,73 @@ class InteractionManager:
             print("Invalid input. Order unchanged.")
             return image_paths
 
-    def _regenerate_image(self, image_paths: List[str]):
-        """Regenerate a specific image"""
+    def _regenerate_image(self, image_paths: List[str], names):
+        """Regenerate a specific image (names: precomputed basenames of image_paths)"""
         print("Enter the number of the image to regenerate:")
-        for i, img_path in enumerate(image_paths, 1):
-            print(f"{i}. {Path(img_path).name}")
-
-        try:
-            idx = int(input("> ").strip()) - 1
-            if 0 <= idx < len(image_paths):
-                print(f"Image {idx + 1} selected for regeneration.")
-                # In a real implementation, this would trigger re-generation
-                # For now, just mark it in state
-                self.current_state["regenerate_index"] = idx
-                self._save_state()
-            else:
-                print("Invalid index.")
-        except ValueError:
-            print("Invalid input.")
+        sys.stdout.write(_numbered(names))
+
+        choice = self._read_int("> ", lo=1, hi=len(image_paths))
+        if choice is not None:
+            print(f"Image {choice} selected for regeneration.")
+            # In a real implementation, this would trigger re-generation
+            # For now, just mark it in state
+            self.update_state("regenerate_index", choice - 1)
+            # The file will be rewritten, so its cached size is stale
+            self._image_sizes.pop(image_paths[choice - 1], None)
+        else:
+            print("Invalid index.")
 
     def get_confirmation(self, message: str) -> bool:
         """Get user confirmation for an action"""
-        response = input(f"{message} (y/n): ").strip().lower()
+        response = self._input(f"{message} (y/n): ").strip().lower()
         return response == 'y'
 
     def show_progress(self, step: str, current: int, total: int):
         """Show progress for a generation step"""
         percentage = (current / total) * 100
-        bar_length = 40
-        filled_length = int(bar_length * current // total)
-        bar = '█' * filled_length + '░' * (bar_length - filled_length)
-        print(f"\r{step}: [{bar}] {current}/{total} ({percentage:.1f}%)", end='')
-        if current == total:
-            print()
-
-    def update_state(self, key, value):
-        """Update a specific state value"""
+        filled_length = min(int(PROGRESS_BAR_LENGTH * current // total), PROGRESS_BAR_LENGTH)
+        bar = PROGRESS_BARS[filled_length]
+        line_end = "\n" if current == total else ""
+        out = sys.stdout
+        out.write(f"\r{step}: [{bar}] {current}/{total} ({percentage:.1f}%){line_end}")
+        out.flush()
+
+    def update_state(self, key, value, persist=True):
+        """
+        Update a specific state value
+
+        Args:
+            key: State key to update
+            value: New value
+            persist: Write the state file immediately. Pass False inside
+                     loops that persist once when they finish; anything
+                     still unwritten is flushed at interpreter exit.
+                     Inside a buffered() block the write is always deferred.
+        """
         self.current_state[key] = value
-        self._save_state()
+        self._dirty = True
+        if persist and self._buffer_depth == 0:
+            self._save_state()
 
     def collect_free_mode_inputs(self):
         """
         Collect inputs for free mode scenario
         Returns: dictionary with collected inputs
         """
-        print("\n" + "============================================================")
-        print("🎨 Free Mode - Custom Prompt Generation")
-        print("============================================================")
+        _emit(SEPARATOR_NL, "🎨 Free Mode - Custom Prompt Generation", SEPARATOR)
 
         inputs = {}
 
         # Step1: Collect reference photos
-        print("\n📸 Step 1: Reference Photos")
-        print("----------------------------------------")
-        print("Free mode supports 1-14 reference photos.")
-        print("Provide photo paths (comma-separated for multiple):")
+        _emit(
+            "\n📸 Step 1: Reference Photos",
+            SUB_SEPARATOR,
+            "Free mode supports 1-14 reference photos.",
+            "Provide photo paths (comma-separated for multiple):"
+        )
 
         while True:
-            photos_input = input("> ").strip()
+            photos_input = self._input("> ").strip()
             if not photos_input:
                 print("❌ At least one photo is required.")
                 continue
@@ -668,14 +828,9 @@ class InteractionManager:
             photo_paths = [p.strip() for p in photos_input.split(',')]
 
             # Validate all photos exist
-            all_valid = True
-            for p in photo_paths:
-                if not Path(p).exists():
-                    print(f"❌ Photo not found: {p}")
-                    all_valid = False
-                    break
-
-            if not all_valid:
+            missing = next((p for p in photo_paths if not os.path.isfile(p)), None)
+            if missing is not None:
+                print(f"❌ Photo not found: {missing}")
                 continue
 
             # Check photo count
@@ -688,30 +843,24 @@ class InteractionManager:
             break
 
             # Step 2: Collect custom prompt
-        print("\n📝 Step 2: Custom Prompt")
-        print("-" * 40)
-        print("Describe the scene, style, atmosphere, and any specific requirements.")
-        print("Examples:")
-        print("  - 'A futuristic cyberpunk portrait with neon lights'")
-        print("  - 'Renaissance oil painting style, dramatic lighting'")
-        print("  - 'A group photo on Mars surface, wearing space suits'")
-        print("  - '1970s vintage photography style, film grain, warm tones'")
+        _emit(
+            "\n📝 Step 2: Custom Prompt",
+            SUB_SEPARATOR,
+            "Describe the scene, style, atmosphere, and any specific requirements.",
+            "Examples:",
+            "  - 'A futuristic cyberpunk portrait with neon lights'",
+            "  - 'Renaissance oil painting style, dramatic lighting'",
+            "  - 'A group photo on Mars surface, wearing space suits'",
+            "  - '1970s vintage photography style, film grain, warm tones'"
+        )
 
         while True:
-            prompt = input("\nEnter your custom prompt (or 'help' for assistance): ").strip()
+            prompt = self._input("\nEnter your custom prompt (or 'help' for assistance): ").strip()
 
             # Check for help request
             if prompt.lower() == 'help':
-                print("\n" + "=" * 60)
-                print("💡 Available Scenarios")
-                print("=" * 60)
-                print("\n1. 图像编辑 - 换衣服、换材质、换背景等")
-                print("2. 多图融合 - 穿搭融合、人景融合、品牌设计等")
-                print("3. 自由模式 - 完全自定义的 prompt 生成")
-                print("4. 个人写真 - 专业个人肖像摄影")
-                print("5. 双人合影 - 情侣或朋友合影")
-                print("6. 全家合影 - 家庭合照（3-6人）")
-                print("7. 明星合影 - 与电影明星拍照留念")
+                _emit(SEPARATOR_NL, "💡 Available Scenarios", SEPARATOR)
+                sys.stdout.write(SCENARIO_HELP)
                 continue
 
             if not prompt:
@@ -721,17 +870,19 @@ class InteractionManager:
             inputs["prompt"] = prompt
             print(f"✓ Prompt: {prompt[:80]}...")
             break
-        print("\n📝 Step 2: Custom Prompt")
-        print("-" * 40)
-        print("Describe the scene, style, atmosphere, and any specific requirements.")
-        print("Examples:")
-        print("  - 'A futuristic cyberpunk portrait with neon lights'")
-        print("  - 'Renaissance oil painting style, dramatic lighting'")
-        print("  - 'A group photo on Mars surface, wearing space suits'")
-        print("  - '1970s vintage photography style, film grain, warm tones'")
+        _emit(
+            "\n📝 Step 2: Custom Prompt",
+            SUB_SEPARATOR,
+            "Describe the scene, style, atmosphere, and any specific requirements.",
+            "Examples:",
+            "  - 'A futuristic cyberpunk portrait with neon lights'",
+            "  - 'Renaissance oil painting style, dramatic lighting'",
+            "  - 'A group photo on Mars surface, wearing space suits'",
+            "  - '1970s vintage photography style, film grain, warm tones'"
+        )
 
         while True:
-            prompt = input("\nEnter your custom prompt: ").strip()
+            prompt = self._input("\nEnter your custom prompt: ").strip()
             if not prompt:
                 print("❌ Custom prompt is required.")
                 continue
@@ -740,13 +891,15 @@ class InteractionManager:
             break
 
         # Step 3: Collect optional negative prompt
-        print("\n🚫 Step 3: Negative Prompt (Optional)")
-        print("-" * 40)
-        print("Specify elements to exclude from generated image.")
-        print("Examples: 'modern, digital, blurry, low quality'")
-        print("Press Enter to skip negative prompt.")
-
-        negative_prompt = input("Negative prompt: ").strip()
+        _emit(
+            "\n🚫 Step 3: Negative Prompt (Optional)",
+            SUB_SEPARATOR,
+            "Specify elements to exclude from generated image.",
+            "Examples: 'modern, digital, blurry, low quality'",
+            "Press Enter to skip negative prompt."
+        )
+
+        negative_prompt = self._input("Negative prompt: ").strip()
         inputs["negative_prompt"] = negative_prompt if negative_prompt else ""
         if negative_prompt:
             print(f"✓ Negative prompt: {negative_prompt[:60]}...")
@@ -754,94 +907,73 @@ class InteractionManager:
             print("✓ No negative prompt")
 
         # Step 4: Collect image count
-        print("\n🔢 Step 4: Number of Images")
-        print("-" * 40)
-        print("How many images would you like to generate? (1-10)")
-        print("Press Enter for default (1):")
-
-        count_input = input("> ").strip()
-        if count_input:
-            try:
-                count = int(count_input)
-                if count < 1 or count > 10:
-                    print("Please enter a number between 1 and 10. Using default (1).")
-                    count = 1
-            except ValueError:
-                print("Invalid number. Using default (1).")
-                count = 1
-        else:
+        _emit(
+            "\n🔢 Step 4: Number of Images",
+            SUB_SEPARATOR,
+            "How many images would you like to generate? (1-10)",
+            "Press Enter for default (1):"
+        )
+
+        count = self._read_int("> ", default=1, lo=1, hi=10)
+        if count is None:
+            print("Please enter a number between 1 and 10. Using default (1).")
             count = 1
 
         inputs["count"] = count
         print(f"✓ Will generate {count} image(s)")
 
-        # Save state
-        self.current_state["free_mode_inputs"] = inputs
-        self._save_state()
+        # Written with the next state save, or by flush() at exit
+        self.update_state("free_mode_inputs", inputs, persist=False)
 
         print("\n✅ Free mode input collection complete!")
         return inputs
 
-    def collect_edit_inputs(self, scenario, inputs):
-        """
-        Collect inputs for edit scenario
+    def _select_template(self, templates: List[Dict], extra_line=None) -> Dict:
         """
-        print("\n" + "=" * 60)
-        print("✏️  Image Editor")
-        print("=" * 60)
+        List templates and let the user pick one, falling back to the first.
 
-        inputs = {}
-
-        photos = self.collect_photos_for_scenario(scenario)
-        inputs["user_photo"] = photos[0] if photos else None
-
-        templates = self.config.get_scenario_data(scenario["id"])
-        if not templates:
-            print("❌ No edit templates available")
-            return inputs
-
-        print("\nAvailable Edit Templates:")
-        for i, template in enumerate(templates, 1):
-            print(f"{i}. {template['name']} ({template['category']})")
-            print(f"   {template['description']}")
+        extra_line, if given, is called with each template and returns one more
+        line to show under its description.
+        """
+        sys.stdout.write("".join(
+            f"{i}. {template['name']} ({template['category']})\n"
+            f"   {template['description']}\n"
+            + (extra_line(template) + "\n" if extra_line is not None else "")
+            for i, template in enumerate(templates, 1)
+        ))
 
         print(f"\nSelect template (1-{len(templates)}):")
-        try:
-            template_idx = int(input("> ").strip()) - 1
-            if 0 <= template_idx < len(templates):
-                selected_template = templates[template_idx]
-                print(f"  ✓ Selected: {selected_template['name']}")
-            else:
-                print("Invalid selection. Using first template.")
-                selected_template = templates[0]
-        except ValueError:
-            selected_template = templates[0]
-
-        inputs["template"] = selected_template
-
+        choice = self._read_int("> ", lo=1, hi=len(templates))
+        if choice is None:
+            print("Invalid selection. Using first template.")
+            return templates[0]
+        selected_template = templates[choice - 1]
+        print(f"  ✓ Selected: {selected_template['name']}")
+        return selected_template
+
+    def _collect_field_values(self, template: Dict) -> Dict:
+        """Prompt for each field a template defines and return the values by field name"""
         field_values = {}
-        for field in selected_template.get("fields", []):
+        for field in template.get("fields", []):
             print(f"\n{field['label']}")
             if field['type'] == 'text':
                 if field.get('required'):
                     while True:
-                        value = input(f"> ").strip()
+                        value = self._input(f"> ").strip()
                         if value:
                             field_values[field['name']] = value
                             break
                         print(f"  ❌ This field is required")
                 else:
-                    value = input(f"> [{field.get('placeholder', '')}]: ").strip()
+                    value = self._input(f"> [{field.get('placeholder', '')}]: ").strip()
                     field_values[field['name']] = value if value else field.get('default', '')
 
             elif field['type'] == 'select':
                 options = field.get('options', [])
-                print("Options:")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
+                sys.stdout.write("Options:\n" + "".join(f"  {i}. {opt}\n" for i, opt in enumerate(options, 1)))
                 try:
                     default_val = field.get('default', options[0] if options else '')
-                    idx_input = input(f"> [{default_val}]: ").strip()
+                    idx_input = self._input(f"> [{default_val}]: ").strip()
                     if idx_input:
                         idx = int(idx_input) - 1
                         if 0 <= idx < len(options):
@@ -855,10 +987,11 @@ class InteractionManager:
 
             elif field['type'] == 'multiselect':
                 options = field.get('options', [])
-                print("Options (comma-separated numbers):")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                indices = input(f"> [{field.get('default', '')}]: ").strip()
+                sys.stdout.write(
+                    "Options (comma-separated numbers):\n"
+                    + "".join(f"  {i}. {opt}\n" for i, opt in enumerate(options, 1))
+                )
+                indices = self._input(f"> [{field.get('default', '')}]: ").strip()
                 try:
                     if indices:
                         idx_list = [int(x.strip()) - 1 for x in indices.split(',')]
@@ -872,18 +1005,40 @@ class InteractionManager:
 
             elif field['type'] == 'boolean':
                 default_val = field.get('default', True)
-                value = input(f"> [y/n, default: {'y' if default_val else 'n'}]: ").strip().lower()
+                value = self._input(f"> [y/n, default: {'y' if default_val else 'n'}]: ").strip().lower()
                 if value in ['y', 'n']:
                     field_values[field['name']] = value == 'y'
                 else:
                     field_values[field['name']] = default_val
 
+        return field_values
+
+    def collect_edit_inputs(self, scenario, inputs):
+        """
+        Collect inputs for edit scenario
+        """
+        _emit(SEPARATOR_NL, "✏️  Image Editor", SEPARATOR)
+
+        inputs = {}
+
+        photos = self.collect_photos_for_scenario(scenario)
+        inputs["user_photo"] = photos[0] if photos else None
+
+        templates = self.config.get_scenario_data(scenario["id"])
+        if not templates:
+            print("❌ No edit templates available")
+            return inputs
+
+        print("\nAvailable Edit Templates:")
+        selected_template = self._select_template(templates)
+
+        inputs["template"] = selected_template
+
+        field_values = self._collect_field_values(selected_template)
         inputs["field_values"] = field_values
 
         prompt_structure = selected_template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
-        field_values_with_default.update(field_values)
-        full_prompt = prompt_structure.format(**field_values_with_default)
+        full_prompt = prompt_structure.format_map(ChainMap(field_values, PHOTO_REFERENCE_DEFAULTS))
 
         inputs["prompt"] = full_prompt
         inputs["negative_prompt"] = selected_template.get("negative_prompt", "")
@@ -896,9 +1051,7 @@ class InteractionManager:
         """
         Collect inputs for fusion scenario
         """
-        print("\n" + "=" * 60)
-        print("🔀 Multi-Image Fusion")
-        print("=" * 60)
+        _emit(SEPARATOR_NL, "🔀 Multi-Image Fusion", SEPARATOR)
 
         inputs = {}
 
@@ -911,98 +1064,22 @@ class InteractionManager:
             return inputs
 
         print("\nAvailable Fusion Templates:")
-        for i, template in enumerate(templates, 1):
-            print(f"{i}. {template['name']} ({template['category']})")
-            print(f"   {template['description']}")
-            print(f"   Required photos: {template['required_photos']}-{template['max_photos']}")
-
-        print(f"\nSelect template (1-{len(templates)}):")
-        try:
-            template_idx = int(input("> ").strip()) - 1
-            if 0 <= template_idx < len(templates):
-                selected_template = templates[template_idx]
-                print(f"  ✓ Selected: {selected_template['name']}")
-            else:
-                print("Invalid selection. Using first template.")
-                selected_template = templates[0]
-        except ValueError:
-            selected_template = templates[0]
+        selected_template = self._select_template(
+            templates,
+            lambda template: f"   Required photos: {template['required_photos']}-{template['max_photos']}"
+        )
 
         inputs["template"] = selected_template
 
-        field_values = {}
-        for field in selected_template.get("fields", []):
-            print(f"\n{field['label']}")
-            if field['type'] == 'text':
-                if field.get('required'):
-                    while True:
-                        value = input(f"> ").strip()
-                        if value:
-                            field_values[field['name']] = value
-                            break
-                        print(f"  ❌ This field is required")
-                else:
-                    value = input(f"> [{field.get('placeholder', '')}]: ").strip()
-                    field_values[field['name']] = value if value else field.get('default', '')
-
-            elif field['type'] == 'select':
-                options = field.get('options', [])
-                print("Options:")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                try:
-                    default_val = field.get('default', options[0] if options else '')
-                    idx_input = input(f"> [{default_val}]: ").strip()
-                    if idx_input:
-                        idx = int(idx_input) - 1
-                        if 0 <= idx < len(options):
-                            field_values[field['name']] = options[idx]
-                        else:
-                            field_values[field['name']] = default_val
-                    else:
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', options[0] if options else '')
-
-            elif field['type'] == 'multiselect':
-                options = field.get('options', [])
-                print("Options (comma-separated numbers):")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                indices = input(f"> [{field.get('default', '')}]: ").strip()
-                try:
-                    if indices:
-                        idx_list = [int(x.strip()) - 1 for x in indices.split(',')]
-                        selected = [options[i] for i in idx_list if 0 <= i < len(options)]
-                        field_values[field['name']] = ", ".join(selected)
-                    else:
-                        default_val = field.get('default', '')
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', '')
-
-            elif field['type'] == 'boolean':
-                default_val = field.get('default', True)
-                value = input(f"> [y/n, default: {'y' if default_val else 'n'}]: ").strip().lower()
-                if value in ['y', 'n']:
-                    field_values[field['name']] = value == 'y'
-                else:
-                    field_values[field['name']] = default_val
-
+        field_values = self._collect_field_values(selected_template)
         inputs["field_values"] = field_values
 
         prompt_structure = selected_template.get("prompt_structure", "")
         photo_count = len(photos)
-        person_instructions = " ".join([
-            f"Person {j+1}: Extract facial features, gender, age, and appearance from reference photo #{j+1} only."
-            for j in range(photo_count)
-        ])
-        field_values_with_default = {
+        full_prompt = prompt_structure.format_map(ChainMap(field_values, {
             "photo_count": photo_count,
-            "person_instructions": person_instructions
-        }
-        field_values_with_default.update(field_values)
-        full_prompt = prompt_structure.format(**field_values_with_default)
+            "person_instructions": fusion_person_instructions(photo_count)
+        }))
 
         inputs["prompt"] = full_prompt
         inputs["negative_prompt"] = selected_template.get("negative_prompt", "")
@@ -1015,9 +1092,7 @@ class InteractionManager:
         """
         Collect inputs for series scenario
         """
-        print("\n" + "=" * 60)
-        print("🖼️  Series Generation")
-        print("=" * 60)
+        _emit(SEPARATOR_NL, "🖼️  Series Generation", SEPARATOR)
 
         inputs = {}
 
@@ -1030,131 +1105,44 @@ class InteractionManager:
             return inputs
 
         print("\nAvailable Series Templates:")
-        for i, template in enumerate(templates, 1):
-            print(f"{i}. {template['name']} ({template['category']})")
-            print(f"   {template['description']}")
-
-        print(f"\nSelect template (1-{len(templates)}):")
-        try:
-            template_idx = int(input("> ").strip()) - 1
-            if 0 <= template_idx < len(templates):
-                selected_template = templates[template_idx]
-                print(f"  ✓ Selected: {selected_template['name']}")
-            else:
-                print("Invalid selection. Using first template.")
-                selected_template = templates[0]
-        except ValueError:
-            selected_template = templates[0]
+        selected_template = self._select_template(templates)
 
         inputs["template"] = selected_template
 
-        field_values = {}
-        for field in selected_template.get("fields", []):
-            print(f"\n{field['label']}")
-            if field['type'] == 'text':
-                if field.get('required'):
-                    while True:
-                        value = input(f"> ").strip()
-                        if value:
-                            field_values[field['name']] = value
-                            break
-                        print(f"  ❌ This field is required")
-                else:
-                    value = input(f"> [{field.get('placeholder', '')}]: ").strip()
-                    field_values[field['name']] = value if value else field.get('default', '')
-
-            elif field['type'] == 'select':
-                options = field.get('options', [])
-                print("Options:")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                try:
-                    default_val = field.get('default', options[0] if options else '')
-                    idx_input = input(f"> [{default_val}]: ").strip()
-                    if idx_input:
-                        idx = int(idx_input) - 1
-                        if 0 <= idx < len(options):
-                            field_values[field['name']] = options[idx]
-                        else:
-                            field_values[field['name']] = default_val
-                    else:
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', options[0] if options else '')
-
-            elif field['type'] == 'multiselect':
-                options = field.get('options', [])
-                print("Options (comma-separated numbers):")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                indices = input(f"> [{field.get('default', '')}]: ").strip()
-                try:
-                    if indices:
-                        idx_list = [int(x.strip()) - 1 for x in indices.split(',')]
-                        selected = [options[i] for i in idx_list if 0 <= i < len(options)]
-                        field_values[field['name']] = ", ".join(selected)
-                    else:
-                        default_val = field.get('default', '')
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', '')
-
-            elif field['type'] == 'boolean':
-                default_val = field.get('default', True)
-                value = input(f"> [y/n, default: {'y' if default_val else 'n'}]: ").strip().lower()
-                if value in ['y', 'n']:
-                    field_values[field['name']] = value == 'y'
-                else:
-                    field_values[field['name']] = default_val
-
+        field_values = self._collect_field_values(selected_template)
         inputs["field_values"] = field_values
 
         prompt_structure = selected_template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
-        field_values_with_default.update(field_values)
+        series_values = {}  # Derived placeholders; these take precedence over field values
 
         template_id = selected_template.get('id', '')
         if template_id == 'seasons':
             count = field_values.get('count', 4)
             scene_instructions = f"场景统一为：{field_values.get('scene', '户外庭院')}。"
 
-            seasonal_descriptions = "\n各季节描述：\n"
-            seasons = [
-                ("春天", "嫩绿新叶，粉红花朵，柔和晨光，生机勃勃"),
-                ("夏天", "翠绿浓荫，金色阳光，强烈日光，热情洋溢"),
-                ("秋天", "橙红落叶，金黄果实，温暖黄昏，丰收喜悦"),
-                ("冬天", "银白雪地，深蓝天空，冷清冬阳，静谧纯净")
-            ]
-            for i, (season, desc) in enumerate(seasons[:count]):
-                seasonal_descriptions += f"图片{i+1}：{season} - {desc}。\n"
+            seasonal_descriptions = "\n各季节描述：\n" + "".join(
+                f"图片{i+1}：{season} - {desc}。\n" for i, (season, desc) in enumerate(SERIES_SEASONS[:count])
+            )
 
-            field_values_with_default['count'] = count
-            field_values_with_default['scene_instructions'] = scene_instructions
-            field_values_with_default['seasonal_descriptions'] = seasonal_descriptions
+            series_values['count'] = count
+            series_values['scene_instructions'] = scene_instructions
+            series_values['seasonal_descriptions'] = seasonal_descriptions
 
         elif template_id == 'character-states':
             count = field_values.get('count', 4)
             state_type = field_values.get('state_type', '动作状态')
             custom_states = field_values.get('custom_states', '')
 
-            state_descriptions = "\n各状态描述：\n"
             if custom_states:
-                states = custom_states.split('、')
-                for i, state in enumerate(states[:count]):
-                    state_descriptions += f"图片{i+1}：{state.strip()}。\n"
+                states = [state.strip() for state in custom_states.split('、')]
             else:
-                default_states = {
-                    "动作状态": ["奔跑", "跳跃", "静止", "转身"],
-                    "表情状态": ["开心", "惊讶", "思考", "平静"],
-                    "服装变化": ["日常装", "运动装", "正式装", "休闲装"],
-                    "道具互动": ["手持相机", "抱着玩偶", "拿着书本", "背着背包"]
-                }
-                states = default_states.get(state_type, default_states["动作状态"])
-                for i, state in enumerate(states[:count]):
-                    state_descriptions += f"图片{i+1}：{state}。\n"
-
-            field_values_with_default['count'] = count
-            field_values_with_default['state_descriptions'] = state_descriptions
+                states = SERIES_DEFAULT_STATES.get(state_type, SERIES_DEFAULT_STATES["动作状态"])
+            state_descriptions = "\n各状态描述：\n" + "".join(
+                f"图片{i+1}：{state}。\n" for i, state in enumerate(states[:count])
+            )
+
+            series_values['count'] = count
+            series_values['state_descriptions'] = state_descriptions
 
         elif template_id == 'story-sequence':
             count = field_values.get('count', 6)
@@ -1162,23 +1150,15 @@ class InteractionManager:
 
             story_outline = f"故事大纲：{theme}。"
 
-            scene_descriptions = "\n场景描述：\n"
-            scene_stages = [
-                "故事开端，介绍主角和初始环境",
-                "发展情节，主角面临挑战或机会",
-                "情节升级，主角采取行动或做出选择",
-                "高潮时刻，关键冲突或转折点",
-                "解决阶段，主角克服困难或达成目标",
-                "结局，展示结果和成长"
-            ]
-            for i in range(min(count, len(scene_stages))):
-                scene_descriptions += f"图片{i+1}：{scene_stages[i]}。\n"
+            scene_descriptions = "\n场景描述：\n" + "".join(
+                f"图片{i+1}：{stage}。\n" for i, stage in enumerate(SERIES_STORY_STAGES[:count])
+            )
 
-            field_values_with_default['count'] = count
-            field_values_with_default['story_outline'] = story_outline
-            field_values_with_default['scene_descriptions'] = scene_descriptions
+            series_values['count'] = count
+            series_values['story_outline'] = story_outline
+            series_values['scene_descriptions'] = scene_descriptions
 
-        full_prompt = prompt_structure.format(**field_values_with_default)
+        full_prompt = prompt_structure.format_map(ChainMap(series_values, field_values, PHOTO_REFERENCE_DEFAULTS))
 
         inputs["prompt"] = full_prompt
         inputs["negative_prompt"] = selected_template.get("negative_prompt", "")
@@ -1191,9 +1171,7 @@ class InteractionManager:
         """
         Collect inputs for poster scenario
         """
-        print("\n" + "=" * 60)
-        print("📄 Poster Design")
-        print("=" * 60)
+        _emit(SEPARATOR_NL, "📄 Poster Design", SEPARATOR)
 
         inputs = {}
 
@@ -1211,90 +1189,15 @@ class InteractionManager:
             return inputs
 
         print("\nAvailable Poster Templates:")
-        for i, template in enumerate(templates, 1):
-            print(f"{i}. {template['name']} ({template['category']})")
-            print(f"   {template['description']}")
-
-        print(f"\nSelect template (1-{len(templates)}):")
-        try:
-            template_idx = int(input("> ").strip()) - 1
-            if 0 <= template_idx < len(templates):
-                selected_template = templates[template_idx]
-                print(f"  ✓ Selected: {selected_template['name']}")
-            else:
-                print("Invalid selection. Using first template.")
-                selected_template = templates[0]
-        except ValueError:
-            selected_template = templates[0]
+        selected_template = self._select_template(templates)
 
         inputs["template"] = selected_template
 
-        field_values = {}
-        for field in selected_template.get("fields", []):
-            print(f"\n{field['label']}")
-            if field['type'] == 'text':
-                if field.get('required'):
-                    while True:
-                        value = input(f"> ").strip()
-                        if value:
-                            field_values[field['name']] = value
-                            break
-                        print(f"  ❌ This field is required")
-                else:
-                    value = input(f"> [{field.get('placeholder', '')}]: ").strip()
-                    field_values[field['name']] = value if value else field.get('default', '')
-
-            elif field['type'] == 'select':
-                options = field.get('options', [])
-                print("Options:")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                try:
-                    default_val = field.get('default', options[0] if options else '')
-                    idx_input = input(f"> [{default_val}]: ").strip()
-                    if idx_input:
-                        idx = int(idx_input) - 1
-                        if 0 <= idx < len(options):
-                            field_values[field['name']] = options[idx]
-                        else:
-                            field_values[field['name']] = default_val
-                    else:
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', options[0] if options else '')
-
-            elif field['type'] == 'multiselect':
-                options = field.get('options', [])
-                print("Options (comma-separated numbers):")
-                for i, opt in enumerate(options, 1):
-                    print(f"  {i}. {opt}")
-                indices = input(f"> [{field.get('default', '')}]: ").strip()
-                try:
-                    if indices:
-                        idx_list = [int(x.strip()) - 1 for x in indices.split(',')]
-                        selected = [options[i] for i in idx_list if 0 <= i < len(options)]
-                        field_values[field['name']] = ", ".join(selected)
-                    else:
-                        default_val = field.get('default', '')
-                        field_values[field['name']] = default_val
-                except ValueError:
-                    field_values[field['name']] = field.get('default', '')
-
-            elif field['type'] == 'boolean':
-                default_val = field.get('default', True)
-                value = input(f"> [y/n, default: {'y' if default_val else 'n'}]: ").strip().lower()
-                if value in ['y', 'n']:
-                    field_values[field['name']] = value == 'y'
-                else:
-                    field_values[field['name']] = default_val
-
+        field_values = self._collect_field_values(selected_template)
         inputs["field_values"] = field_values
 
         prompt_structure = selected_template.get("prompt_structure", "")
-        field_values_with_default = {"原照片的": "参考"}
-        field_values_with_default.update(field_values)
-
-        full_prompt = prompt_structure.format(**field_values_with_default)
+        full_prompt = prompt_structure.format_map(ChainMap(field_values, PHOTO_REFERENCE_DEFAULTS))
 
         inputs["prompt"] = full_prompt
         inputs["negative_prompt"] = selected_template.get("negative_prompt", "")
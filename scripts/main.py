@@ -5,27 +5,18 @@ Main entry point for Photo Studio
 
 import sys
 import os
-import time
+import json
+import logging
 import argparse
+import shutil
+import traceback
 from pathlib import Path
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import config
-from interaction import InteractionManager
-from image_generator import ImageGenerator
-from scenario_handlers import (
-    handle_portrait_scenario,
-    handle_couple_scenario,
-    handle_family_scenario,
-    handle_free_scenario,
-    handle_edit_scenario,
-    handle_fusion_scenario,
-    handle_series_scenario,
-    handle_poster_scenario,
-    handle_celebrity_scenario
-)
+from prompt_defaults import LOGGER_NAME, SEPARATOR, SEPARATOR_NL, SUB_SEPARATOR
 
 def check_api_keys():
     """Check if required API credentials are configured"""
@@ -36,175 +27,194 @@ def check_api_keys():
     print("❌ API credentials not configured. Please configure API credentials before running.")
     return False
 
-def setup_argparse():
-    """Set up command line argument parsing"""
-    parser = argparse.ArgumentParser(
-        description="Photo Studio - Generate portrait and group photos using AI",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python main.py generate --photo path/to/photo.jpg --scenario portrait
-  python main.py generate --photos photo1.jpg,photo2.jpg --scenario couple
-  python main.py generate --photo photo.jpg --scenario free --prompt "A futuristic cyberpunk portrait" --count 3
-  python main.py generate --photos p1.jpg,p2.jpg,p3.jpg --scenario free --prompt "A group photo on the moon surface"
-  python main.py list-scenarios
-  python main.py list-styles --scenario portrait
-        """
-    )
-
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-
-    # Generate command
-    generate_parser = subparsers.add_parser("generate", help="Start the generation process")
+def _image_count(value):
+    """argparse type for --count: an int between 1 and generation.max_image_count"""
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    max_count = int(config.config.get("generation", {}).get("max_image_count", 10))
+    if not 1 <= count <= max_count:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {max_count}")
+    return count
+
+# Options every subcommand accepts after its name. SUPPRESS leaves the
+# top-level default alone, so "main.py -q generate" stays quiet.
+COMMON_OPTIONS = argparse.ArgumentParser(add_help=False)
+COMMON_OPTIONS.add_argument("--quiet", "-q", action="store_true", default=argparse.SUPPRESS,
+                            help="Suppress generation banners and summaries")
+
+def _add_generate_parser(subparsers):
+    generate_parser = subparsers.add_parser("generate", help="Start the generation process", parents=[COMMON_OPTIONS])
     generate_parser.add_argument("--photo", "-p", help="Path to user photo (for single photo scenarios)")
     generate_parser.add_argument("--photos", help="Comma-separated photo paths (for multi-photo scenarios)")
-    generate_parser.add_argument("--scenario", "-s", help="Scenario type (celebrity, portrait, couple, family, free, edit, fusion, series, poster)")
+    generate_parser.add_argument("--scenario", "-s",
+                                 default=config.config.get("scenarios", {}).get("default_scenario", "celebrity"),
+                                 choices=[scenario["id"] for scenario in config.get_all_scenarios()],
+                                 metavar="SCENARIO",
+                                 help="Scenario type (celebrity, portrait, couple, family, free, edit, fusion, series, poster)")
     generate_parser.add_argument("--style", help="Style name (for portrait scenario)")
     generate_parser.add_argument("--pose", help="Pose name (for couple scenario)")
     generate_parser.add_argument("--template", "-t", help="Template name (for family, edit, fusion, series, and poster scenarios)")
     generate_parser.add_argument("--background", help="Background name (for couple/family scenarios)")
     generate_parser.add_argument("--prompt", help="Custom prompt (for free mode scenario)")
     generate_parser.add_argument("--negative-prompt", help="Negative prompt (optional, for free mode)")
-    generate_parser.add_argument("--count", "-c", type=int, help="Number of images to generate")
+    generate_parser.add_argument("--count", "-c", type=_image_count, help="Number of images to generate")
     generate_parser.add_argument("--characters", "-ch", help="Comma-separated character names (for celebrity scenario)")
     generate_parser.add_argument("--skip-review", action="store_true", help="Skip image review step")
     generate_parser.add_argument("--non-interactive", "-ni", action="store_true",
                                  help="Run in non-interactive mode (for agent integration)")
 
-    # List scenarios command
-    subparsers.add_parser("list-scenarios", help="List available photo scenarios")
+def _add_json_flag(parser):
+    parser.add_argument("--json", action="store_true", help="Print the raw items as JSON (for agent integration)")
+
+def _add_list_scenarios_parser(subparsers):
+    list_scenarios_parser = subparsers.add_parser("list-scenarios", help="List available photo scenarios", parents=[COMMON_OPTIONS])
+    _add_json_flag(list_scenarios_parser)
 
-    # List styles command
-    list_styles_parser = subparsers.add_parser("list-styles", help="List available styles for a scenario")
+def _add_list_styles_parser(subparsers):
+    list_styles_parser = subparsers.add_parser("list-styles", help="List available styles for a scenario", parents=[COMMON_OPTIONS])
     list_styles_parser.add_argument("--scenario", "-s", help="Scenario type (portrait, couple, family)")
+    _add_json_flag(list_styles_parser)
 
-    # List poses command (for couple scenario)
-    subparsers.add_parser("list-poses", help="List available couple poses")
+def _add_list_poses_parser(subparsers):
+    # For couple scenario
+    list_poses_parser = subparsers.add_parser("list-poses", help="List available couple poses", parents=[COMMON_OPTIONS])
+    _add_json_flag(list_poses_parser)
 
-    # List templates command (for family scenario)
-    subparsers.add_parser("list-templates", help="List available family templates")
+def _add_list_templates_parser(subparsers):
+    # For family scenario
+    list_templates_parser = subparsers.add_parser("list-templates", help="List available family templates", parents=[COMMON_OPTIONS])
+    _add_json_flag(list_templates_parser)
 
-    # List backgrounds command
-    list_backgrounds_parser = subparsers.add_parser("list-backgrounds", help="List available backgrounds for a scenario")
+def _add_list_backgrounds_parser(subparsers):
+    list_backgrounds_parser = subparsers.add_parser("list-backgrounds", help="List available backgrounds for a scenario", parents=[COMMON_OPTIONS])
     list_backgrounds_parser.add_argument("--scenario", "-s", help="Scenario type (couple, family)")
+    _add_json_flag(list_backgrounds_parser)
 
-    # List characters command
-    subparsers.add_parser("list-characters", help="List available movie characters")
+def _add_list_characters_parser(subparsers):
+    list_characters_parser = subparsers.add_parser("list-characters", help="List available movie characters", parents=[COMMON_OPTIONS])
+    _add_json_flag(list_characters_parser)
 
-    # Add character command
-    add_parser = subparsers.add_parser("add-character", help="Add a custom movie character")
+def _add_add_character_parser(subparsers):
+    add_parser = subparsers.add_parser("add-character", help="Add a custom movie character", parents=[COMMON_OPTIONS])
     add_parser.add_argument("name", help="Character name")
     add_parser.add_argument("prompt", help="Character description prompt")
     add_parser.add_argument("--scene", help="Scene description (optional)")
 
-    # Config command
-    config_parser = subparsers.add_parser("config", help="View or update configuration")
+def _add_config_parser(subparsers):
+    config_parser = subparsers.add_parser("config", help="View or update configuration", parents=[COMMON_OPTIONS])
     config_parser.add_argument("--show", action="store_true", help="Show current configuration")
     config_parser.add_argument("--set", help="Set configuration value (format: section.key=value)")
 
-    # Cleanup command
-    subparsers.add_parser("cleanup", help="Clean up temporary files")
-
-    return parser
+def _add_cleanup_parser(subparsers):
+    subparsers.add_parser("cleanup", help="Clean up temporary files", parents=[COMMON_OPTIONS])
+
+# Subparser builders keyed by command name, in help order
+SUBPARSER_BUILDERS = {
+    "generate": _add_generate_parser,
+    "list-scenarios": _add_list_scenarios_parser,
+    "list-styles": _add_list_styles_parser,
+    "list-poses": _add_list_poses_parser,
+    "list-templates": _add_list_templates_parser,
+    "list-backgrounds": _add_list_backgrounds_parser,
+    "list-characters": _add_list_characters_parser,
+    "add-character": _add_add_character_parser,
+    "config": _add_config_parser,
+    "cleanup": _add_cleanup_parser,
+}
+
+def _add_subparser(subparsers, name):
+    """Build the subparser for a single command"""
+    SUBPARSER_BUILDERS[name](subparsers)
+
+def setup_argparse(command=None):
+    """Set up command line argument parsing
+
+    When ``command`` names a known subcommand, only that subparser is built.
+    """
+    parser = argparse.ArgumentParser(
+        description="Photo Studio - Generate portrait and group photos using AI",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python main.py generate --photo path/to/photo.jpg --scenario portrait
+  python main.py generate --photos photo1.jpg,photo2.jpg --scenario couple
+  python main.py generate --photo photo.jpg --scenario free --prompt "A futuristic cyberpunk portrait" --count 3
+  python main.py generate --photos p1.jpg,p2.jpg,p3.jpg --scenario free --prompt "A group photo on the moon surface"
+  python main.py list-scenarios
+  python main.py list-styles --scenario portrait
+        """
+    )
 
-def command_generate(args):
-    """Handle generate command"""
-    print("\n📷 Photo Studio")
-    print("=" * 60)
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Suppress generation banners and summaries")
 
-    # Check API keys
-    if not check_api_keys():
-        return 1
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
-    # Initialize managers
-    interaction = InteractionManager(config)
-    image_gen = ImageGenerator(config, interaction)
+    # Only the dispatched command needs its parser; help/unknown builds all
+    if command in SUBPARSER_BUILDERS:
+        _add_subparser(subparsers, command)
+    else:
+        for name in SUBPARSER_BUILDERS:
+            _add_subparser(subparsers, name)
 
-    # Non-interactive mode (for agent integration)
-    if getattr(args, 'non_interactive', False):
-        print("\n🤖 Running in non-interactive mode...")
+    return parser
 
-        # Get scenario type
-        scenario_id = getattr(args, 'scenario', 'celebrity')
-        generated_images = []
-
-        # Handle different scenarios using extracted handlers
-        if scenario_id == 'portrait':
-            success, generated_images = handle_portrait_scenario(args, config, image_gen)
-        elif scenario_id == 'couple':
-            success, generated_images = handle_couple_scenario(args, config, image_gen)
-        elif scenario_id == 'family':
-            success, generated_images = handle_family_scenario(args, config, image_gen)
-        elif scenario_id == 'free':
-            success, generated_images = handle_free_scenario(args, config, image_gen)
-        elif scenario_id == 'edit':
-            success, generated_images = handle_edit_scenario(args, config, image_gen)
-        elif scenario_id == 'fusion':
-            success, generated_images = handle_fusion_scenario(args, config, image_gen)
-        elif scenario_id == 'series':
-            success, generated_images = handle_series_scenario(args, config, image_gen)
-        elif scenario_id == 'poster':
-            success, generated_images = handle_poster_scenario(args, config, image_gen)
-        else:
-            success, generated_images = handle_celebrity_scenario(args, config, image_gen)
+def _print_banner(args, title):
+    """Print a section banner unless --quiet was given"""
+    if not args.quiet:
+        print(f"{SEPARATOR_NL}\n{title}\n{SEPARATOR}")
 
-        if not success:
-            return 1
+def _generate_non_interactive(args, image_gen):
+    """Run the scenario handler for --non-interactive and print the summary"""
+    from scenario_handlers import SCENARIO_HANDLERS, handle_celebrity_scenario
 
-        # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
-        print(f"✅ Successfully generated: {len(generated_images)} images")
+    if not args.quiet:
+        print("\n🤖 Running in non-interactive mode...")
 
-        # Generation complete
-        print("\n" + "=" * 60)
-        print("✅ Photo Generation Complete!")
-        print("=" * 60)
-        print(f"\nGenerated {len(generated_images)} photos:")
-        for i, img_path in enumerate(generated_images, 1):
-            print(f"  {i}. {Path(img_path).name}")
-        print(f"\nImages saved in: {image_gen.image_dir}")
+    handler = SCENARIO_HANDLERS.get(args.scenario, handle_celebrity_scenario)
+    success, generated_images = handler(args, config, image_gen)
+    if not success:
+        return 1
 
-        # Cleanup
-        image_gen.cleanup_temp_files()
+    # Summary
+    if not args.quiet:
+        _print_banner(args, "📊 Generation Summary")
+        print(f"✅ Successfully generated: {len(generated_images)} images")
 
-        return 0
+    # Generation complete; the file list is printed even with --quiet
+    _print_banner(args, "✅ Photo Generation Complete!")
+    print(f"\nGenerated {len(generated_images)} photos:")
+    for i, img_path in enumerate(generated_images, 1):
+        print(f"  {i}. {os.path.basename(img_path)}")
+    print(f"\nImages saved in: {image_gen.image_dir}")
 
-    # Interactive mode
-    print("\n📷 Photo Studio Generation Wizard")
-    print("=" * 60)
+    # Cleanup
+    image_gen.cleanup_temp_files()
 
-    # Step 1: Photo selection
-    if not interaction.current_state.get("user_photo"):
-        print("\n📷 Step 1: User Photo")
-        print("-" * 40)
-        photo_input = input("Please enter path to your photo: ").strip()
-        if not Path(photo_input).exists():
-            print(f"❌ Photo not found: {photo_input}")
-            return 1
-        photo_path = photo_input
-        interaction.update_state("user_photo", photo_path)
-    else:
-        photo_path = interaction.current_state["user_photo"]
-        print(f"\nUsing previously selected photo: {photo_path}")
+    return 0
 
-    # Step 2: Character/Style/Type selection
-    # Get scenario to determine what to select
-    scenario_id = getattr(args, 'scenario', None) or config.config.get("scenarios", {}).get("default_scenario", "celebrity")
+def _generate_celebrity_interactive(args, interaction, image_gen, photo_path):
+    """Interactive celebrity flow: pick characters and count, then generate"""
+    from interaction import parse_character_line
 
-    # For celebrity scenario, select characters
-    if scenario_id == "celebrity":
-        all_chars = config.get_characters()
+    all_chars = config.get_characters()
 
+    # Steps 2 and 3 are persisted together in one state write
+    with interaction.buffered():
         if not interaction.current_state.get("selected_characters"):
             print("\n🌟 Step 2: Select Movie Characters")
-            print("-" * 40)
+            print(SUB_SEPARATOR)
             print(f"Found {len(all_chars)} available characters.")
 
-            # Show character list
-            for i, char in enumerate(all_chars, 1):
-                print(f"{i}. {char['name']}")
+            # Show a preview of the character list; 'more' lists the rest
+            preview = int(config.config.get("ui", {}).get("char_list_preview", 10))
+            lines = [f"{i}. {char['name']}" for i, char in enumerate(all_chars[:preview], 1)]
+            hidden = len(all_chars) - preview
+            if hidden > 0:
+                lines.append(f"... and {hidden} more (type 'more' to list all)")
+            _write_lines(lines)
 
             print("\nOptions:")
             print("1. Use first few characters (recommended)")
@@ -213,19 +223,19 @@ def command_generate(args):
             print("4. Enter custom movie characters")
 
             choice = input("\nEnter your choice (1-4): ").strip()
+            if choice == "more" and hidden > 0:
+                _write_lines([f"{i}. {char['name']}" for i, char in enumerate(all_chars[preview:], preview + 1)])
+                choice = input("\nEnter your choice (1-4): ").strip()
 
             selected_chars = []
+            count = args.count or config.config.get("generation", {}).get("default_image_count", 1)
             if choice == "1":
-                default_count = config.config["generation"]["default_image_count"]
-                count = getattr(args, 'count', default_count)
                 selected_chars = all_chars[:count]
                 print(f"Selected first {len(selected_chars)} characters.")
             elif choice == "2":
                 selected_chars = all_chars
                 print(f"Selected all {len(selected_chars)} characters.")
             elif choice == "3":
-                default_count = config.config["generation"]["default_image_count"]
-                count = getattr(args, 'count', default_count)
                 selected_chars = all_chars[:count]
                 print(f"AI suggested: {', '.join([c['name'] for c in selected_chars])}")
             elif choice == "4":
@@ -243,24 +253,7 @@ def command_generate(args):
                         else:
                             continue
 
-                    # Parse line
-                    parts = line.split("|")
-                    if len(parts) >= 2:
-                        name = parts[0].strip()
-                        prompt = parts[1].strip()
-                        scene = parts[2].strip() if len(parts) >= 3 else "movie set with crew members working, cameras and equipment visible"
-                        selected_chars.append({
-                            "name": name,
-                            "prompt": prompt,
-                            "scene": scene
-                        })
-                    else:
-                        # Just name provided
-                        selected_chars.append({
-                            "name": line.strip(),
-                            "prompt": f"{line.strip()} on film set, between takes, cinematic lighting",
-                            "scene": "movie set with crew members working, cameras and equipment visible"
-                        })
+                    selected_chars.append(parse_character_line(line))
 
             interaction.update_state("selected_characters", selected_chars)
         else:
@@ -270,7 +263,7 @@ def command_generate(args):
         # Step 3: Number of images
         if not interaction.current_state.get("image_count"):
             print("\n🎬 Step 3: Number of Images")
-            print("-" * 40)
+            print(SUB_SEPARATOR)
             count_input = input(f"How many characters would you like to be with? (default: {len(selected_chars)}): ").strip()
             if count_input:
                 try:
@@ -289,151 +282,139 @@ def command_generate(args):
             count = interaction.current_state["image_count"]
             print(f"\nUsing {count} images as previously selected.")
 
-        # Limit to requested count
-        selected_chars = selected_chars[:count]
-
-        # Generate images
-        print("\n" + "=" * 60)
-        print("🖼️  Image Generation Started")
-        print("=" * 60)
+    # Limit to requested count
+    selected_chars = selected_chars[:count]
 
-        generated_images = []
-        failed_characters = []
+    # Generate images
+    _print_banner(args, "🖼️  Image Generation Started")
 
-        for i, character in enumerate(selected_chars):
-            print(f"\nGenerating image {i+1}/{len(selected_chars)}: {character['name']}")
+    results = image_gen.generate_character_images(photo_path, selected_chars)
+    generated_images = [path for path in results if path]
+    failed_characters = [c['name'] for c, path in zip(selected_chars, results) if not path]
+    interaction.update_state("generated_images", generated_images, persist=False)
 
-            image_path = image_gen.generate_single_image(photo_path, character, i)
-
-            if image_path:
-                generated_images.append(image_path)
-                interaction.update_state("generated_images", generated_images)
-            else:
-                failed_characters.append(character['name'])
-
-            # Rate limiting - wait between requests
-            if i < len(selected_chars) - 1:
-                time.sleep(2)
-
-        # Summary
-        print("\n" + "=" * 60)
-        print("📊 Generation Summary")
-        print("=" * 60)
+    # Summary
+    if not args.quiet:
+        _print_banner(args, "📊 Generation Summary")
         print(f"✅ Successfully generated: {len(generated_images)} images")
-        if failed_characters:
-            print(f"❌ Failed for: {', '.join(failed_characters)}")
-
-        interaction.current_state["image_order"] = generated_images.copy()
-        interaction._save_state()
-
-        # Show generated images
-        interaction.show_generated_images(generated_images)
+    if failed_characters:
+        print(f"❌ Failed for: {', '.join(failed_characters)}")
 
-        return 0
-    elif scenario_id == 'free':
-        # Free mode interactive flow
-        inputs = interaction.collect_free_mode_inputs()
+    interaction.update_state("image_order", generated_images.copy())
 
-        if not inputs:
-            print("❌ Failed to collect free mode inputs.")
-            return 1
+    # Show generated images
+    interaction.show_generated_images(generated_images)
 
-        # Generate free mode images
-        print("\n" + "=" * 60)
-        print("🖼️  Image Generation Started")
-        print("=" * 60)
-
-        result = image_gen.generate_free_mode_images(
-            inputs["photos"],
-            inputs["prompt"],
-            inputs["count"],
-            inputs["negative_prompt"]
-        )
+    return 0
 
-        generated_images = result if result else []
+def _generate_free_interactive(args, interaction, image_gen, photo_path):
+    """Interactive free mode flow"""
+    inputs = interaction.collect_free_mode_inputs()
 
-        # Show generated images
-        if generated_images:
-            interaction.show_generated_images(generated_images)
+    if not inputs:
+        print("❌ Failed to collect free mode inputs.")
+        return 1
 
-        return 0
-    elif scenario_id == 'edit':
-        inputs = interaction.collect_edit_inputs(config.get_scenario(scenario_id), inputs={})
+    # Generate free mode images
+    _print_banner(args, "🖼️  Image Generation Started")
 
-        if not inputs:
-            print("❌ Failed to collect edit inputs.")
-            return 1
+    result = image_gen.generate_free_mode_images(
+        inputs["photos"],
+        inputs["prompt"],
+        inputs["count"],
+        inputs["negative_prompt"]
+    )
 
-        result = image_gen.generate_edit_images(
-            inputs["user_photo"],
-            inputs["template"],
-            inputs["field_values"]
-        )
+    generated_images = result if result else []
 
-        generated_images = result if result else []
+    # Show generated images
+    if generated_images:
+        interaction.show_generated_images(generated_images)
 
-        if generated_images:
-            interaction.show_generated_images(generated_images)
+    return 0
 
-        return 0
-    elif scenario_id == 'fusion':
-        inputs = interaction.collect_fusion_inputs(config.get_scenario(scenario_id), inputs={})
+# Template wizards: scenario id -> (InteractionManager collector, ImageGenerator method, photo input key)
+TEMPLATE_WIZARDS = {
+    "edit": ("collect_edit_inputs", "generate_edit_images", "user_photo"),
+    "fusion": ("collect_fusion_inputs", "generate_fusion_images", "photos"),
+    "series": ("collect_series_inputs", "generate_series_images", "user_photo"),
+    "poster": ("collect_poster_inputs", "generate_poster_images", "user_photo"),
+}
 
-        if not inputs:
-            print("❌ Failed to collect fusion inputs.")
-            return 1
+def _generate_template_interactive(args, interaction, image_gen, photo_path):
+    """Interactive flow shared by the template scenarios (edit, fusion, series, poster)"""
+    scenario_id = args.scenario
+    collector, generator, photo_key = TEMPLATE_WIZARDS[scenario_id]
 
-        result = image_gen.generate_fusion_images(
-            inputs["photos"],
-            inputs["template"],
-            inputs["field_values"]
-        )
+    inputs = getattr(interaction, collector)(config.get_scenario(scenario_id), inputs={})
 
-        generated_images = result if result else []
+    if not inputs:
+        print(f"❌ Failed to collect {scenario_id} inputs.")
+        return 1
 
-        if generated_images:
-            interaction.show_generated_images(generated_images)
+    result = getattr(image_gen, generator)(
+        inputs[photo_key],
+        inputs["template"],
+        inputs["field_values"]
+    )
 
-        return 0
-    elif scenario_id == 'series':
-        inputs = interaction.collect_series_inputs(config.get_scenario(scenario_id), inputs={})
+    generated_images = result if result else []
 
-        if not inputs:
-            print("❌ Failed to collect series inputs.")
-            return 1
+    if generated_images:
+        interaction.show_generated_images(generated_images)
 
-        result = image_gen.generate_series_images(
-            inputs["user_photo"],
-            inputs["template"],
-            inputs["field_values"]
-        )
+    return 0
 
-        generated_images = result if result else []
+# Interactive flows keyed by scenario id
+INTERACTIVE_FLOWS = {
+    "celebrity": _generate_celebrity_interactive,
+    "free": _generate_free_interactive,
+    **dict.fromkeys(TEMPLATE_WIZARDS, _generate_template_interactive),
+}
 
-        if generated_images:
-            interaction.show_generated_images(generated_images)
+def command_generate(args):
+    """Handle generate command"""
+    if not args.quiet:
+        print(f"\n📷 Photo Studio\n{SEPARATOR}")
 
-        return 0
-    elif scenario_id == 'poster':
-        inputs = interaction.collect_poster_inputs(config.get_scenario(scenario_id), inputs={})
+    # Check API keys
+    if not check_api_keys():
+        return 1
 
-        if not inputs:
-            print("❌ Failed to collect poster inputs.")
-            return 1
+    # The generation stack (requests, cv2, numpy) is only needed here
+    from interaction import InteractionManager
+    from image_generator import ImageGenerator
 
-        result = image_gen.generate_poster_images(
-            inputs["user_photo"],
-            inputs["template"],
-            inputs["field_values"]
-        )
+    # Initialize managers
+    interaction = InteractionManager(config)
+    image_gen = ImageGenerator(config, interaction)
 
-        generated_images = result if result else []
+    # Non-interactive mode (for agent integration)
+    if args.non_interactive:
+        return _generate_non_interactive(args, image_gen)
 
-        if generated_images:
-            interaction.show_generated_images(generated_images)
+    # Interactive mode
+    print("\n📷 Photo Studio Generation Wizard")
+    print(SEPARATOR)
 
-        return 0
+    # Step 1: Photo selection
+    if not interaction.current_state.get("user_photo"):
+        print("\n📷 Step 1: User Photo")
+        print(SUB_SEPARATOR)
+        photo_input = input("Please enter path to your photo: ").strip()
+        if not os.path.exists(photo_input):
+            print(f"❌ Photo not found: {photo_input}")
+            return 1
+        photo_path = photo_input
+        interaction.update_state("user_photo", photo_path)
     else:
+        photo_path = interaction.current_state["user_photo"]
+        print(f"\nUsing previously selected photo: {photo_path}")
+
+    # Step 2 onwards depends on the scenario
+    scenario_id = args.scenario
+    flow = INTERACTIVE_FLOWS.get(scenario_id)
+    if flow is None:
         # For new scenarios (portrait, couple, family), not yet fully implemented
         print(f"\n⚠️ Scenario '{scenario_id}' interactive mode not yet implemented.")
         print("Use non-interactive mode for now.")
@@ -441,30 +422,60 @@ def command_generate(args):
         print(f"  python scripts/main.py generate --photo your_photo.jpg --scenario {scenario_id} --non-interactive")
         return 1
 
+    return flow(args, interaction, image_gen, photo_path)
+
+# Optional style fields shown by list-styles, in display order
+STYLE_DETAIL_FIELDS = (
+    ("Lighting", "lighting"),
+    ("Background", "background"),
+    ("Mood", "mood"),
+    ("Attire", "attire"),
+    ("Scene", "scene"),
+    ("Atmosphere", "atmosphere"),
+)
+
+def _trunc(item, key, width):
+    """Return item[key] cut to width characters, or '' when missing"""
+    value = item.get(key)
+    return value[:width] if value else ""
+
+def _write_lines(lines):
+    """Write a whole listing to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _write_json(data):
+    """Write list-* items as JSON, skipping the human-readable formatting"""
+    sys.stdout.write(json.dumps(data, ensure_ascii=False) + "\n")
+
 def command_list_scenarios(args):
     """Handle list-scenarios command"""
     scenarios = config.get_all_scenarios()
 
-    print("\n" + "=" * 60)
+    if args.json:
+        _write_json(scenarios)
+        return 0
+
+    print(SEPARATOR_NL)
     print("📷 Available Photo Scenarios")
-    print("=" * 60)
+    print(SEPARATOR)
 
     if not scenarios:
         print("No scenarios found. Check configuration.")
         return 1
 
-    print("\nAvailable Scenarios:\n")
+    lines = ["\nAvailable Scenarios:\n"]
     for i, scenario in enumerate(scenarios, 1):
-        print(f"{i}. {scenario['name']}")
-        print(f"   ID: {scenario['id']}")
-        print(f"   Description: {scenario['description']}")
-        print(f"   Input Type: {scenario.get('input_type', 'unknown')}")
-        print(f"   Required Photos: {scenario.get('required_photos', 'N/A')}")
-        print(f"   Max Photos: {scenario.get('max_photos', 'N/A')}")
-        print()
-
-    print(f"Total: {len(scenarios)} scenarios")
-    print(f"Default: {config.config.get('scenarios', {}).get('default_scenario', 'celebrity')}")
+        lines.append(f"{i}. {scenario['name']}")
+        lines.append(f"   ID: {scenario['id']}")
+        lines.append(f"   Description: {scenario['description']}")
+        lines.append(f"   Input Type: {scenario.get('input_type', 'unknown')}")
+        lines.append(f"   Required Photos: {scenario.get('required_photos', 'N/A')}")
+        lines.append(f"   Max Photos: {scenario.get('max_photos', 'N/A')}")
+        lines.append("")
+
+    lines.append(f"Total: {len(scenarios)} scenarios")
+    lines.append(f"Default: {config.config.get('scenarios', {}).get('default_scenario', 'celebrity')}")
+    _write_lines(lines)
     return 0
 
 def command_list_styles(args):
@@ -495,38 +506,35 @@ def command_list_styles(args):
         print(f"❌ No styles found for scenario '{scenario_id}'.")
         return 1
 
-    print("\n" + "=" * 60)
-    print(f"🎨 Styles for Scenario: {scenario['name']}")
-    print("=" * 60)
+    if args.json:
+        _write_json(styles)
+        return 0
 
-    print(f"\nTotal: {len(styles)} styles")
-    print()
+    lines = [
+        SEPARATOR_NL,
+        f"🎨 Styles for Scenario: {scenario['name']}",
+        SEPARATOR,
+        f"\nTotal: {len(styles)} styles",
+        "",
+    ]
 
     if isinstance(styles, list):
         for i, style in enumerate(styles, 1):
             category = style.get('category', 'General')
-            print(f"{i}. {style['name']} ({category})")
-            print(f"   ID: {style.get('id', 'N/A')}")
-            print(f"   Prompt: {style.get('prompt', '')[:60]}...")
-            if style.get('lighting'):
-                print(f"   Lighting: {style.get('lighting', '')[:60]}...")
-            if style.get('background'):
-                print(f"   Background: {style.get('background', '')[:60]}...")
-            if style.get('mood'):
-                print(f"   Mood: {style.get('mood', '')[:60]}...")
-            if style.get('attire'):
-                print(f"   Attire: {style['attire'][:60]}...")
-            if style.get('scene'):
-                print(f"   Scene: {style['scene'][:60]}...")
-            if style.get('atmosphere'):
-                print(f"   Atmosphere: {style['atmosphere'][:60]}...")
-            print()
+            lines.append(f"{i}. {style['name']} ({category})")
+            lines.append(f"   ID: {style.get('id', 'N/A')}")
+            lines.append(f"   Prompt: {_trunc(style, 'prompt', 60)}...")
+            for label, key in STYLE_DETAIL_FIELDS:
+                if style.get(key):
+                    lines.append(f"   {label}: {style[key][:60]}...")
+            lines.append("")
     else:
-        print(f"Data type: {type(styles)}")
-        print(f"Keys: {list(styles.keys()) if isinstance(styles, dict) else 'N/A'}")
+        lines.append(f"Data type: {type(styles)}")
+        lines.append(f"Keys: {list(styles.keys()) if isinstance(styles, dict) else 'N/A'}")
 
-    print(f"\nScenario Data File: {data_file}")
-    print("=" * 60)
+    lines.append(f"\nScenario Data File: {data_file}")
+    lines.append(SEPARATOR)
+    _write_lines(lines)
     return 0
 
 def command_list_backgrounds(args):
@@ -550,19 +558,25 @@ def command_list_backgrounds(args):
         print(f"❌ No backgrounds found for scenario '{scenario_id}'.")
         return 1
 
-    scenario_name = "双人合影" if scenario_id == 'couple' else "全家合影"
-    print("\n" + "=" * 60)
-    print(f"🎨 Backgrounds for Scenario: {scenario_name}")
-    print("=" * 60)
+    if args.json:
+        _write_json(backgrounds)
+        return 0
 
-    print(f"\nTotal: {len(backgrounds)} backgrounds\n")
+    scenario_name = "双人合影" if scenario_id == 'couple' else "全家合影"
+    lines = [
+        SEPARATOR_NL,
+        f"🎨 Backgrounds for Scenario: {scenario_name}",
+        SEPARATOR,
+        f"\nTotal: {len(backgrounds)} backgrounds\n",
+    ]
 
     for i, bg in enumerate(backgrounds, 1):
-        print(f"{i}. {bg['name']}")
-        print(f"   ID: {bg.get('id', 'N/A')}")
-        print(f"   Description: {bg.get('prompt', '')[:80]}...")
+        lines.append(f"{i}. {bg['name']}")
+        lines.append(f"   ID: {bg.get('id', 'N/A')}")
+        lines.append(f"   Description: {_trunc(bg, 'prompt', 80)}...")
 
-    print("\n" + "=" * 60)
+    lines.append(SEPARATOR_NL)
+    _write_lines(lines)
     return 0
 
 def command_list_poses(args):
@@ -572,23 +586,29 @@ def command_list_poses(args):
         print("❌ No poses found for couple scenario.")
         return 1
 
-    print("\n" + "=" * 60)
-    print("👫 Available Couple Poses")
-    print("=" * 60)
+    if args.json:
+        _write_json(poses)
+        return 0
 
-    print(f"\nTotal: {len(poses)} poses\n")
+    lines = [
+        SEPARATOR_NL,
+        "👫 Available Couple Poses",
+        SEPARATOR,
+        f"\nTotal: {len(poses)} poses\n",
+    ]
 
     for i, pose in enumerate(poses, 1):
-        print(f"{i}. {pose['name']}")
-        print(f"   ID: {pose.get('id', 'N/A')}")
-        print(f"   Pose: {pose.get('prompt', '')[:80]}...")
-        print(f"   Scene: {pose.get('scene', '')[:80]}...")
-        print(f"   Atmosphere: {pose.get('atmosphere', '')[:80]}...")
+        lines.append(f"{i}. {pose['name']}")
+        lines.append(f"   ID: {pose.get('id', 'N/A')}")
+        lines.append(f"   Pose: {_trunc(pose, 'prompt', 80)}...")
+        lines.append(f"   Scene: {_trunc(pose, 'scene', 80)}...")
+        lines.append(f"   Atmosphere: {_trunc(pose, 'atmosphere', 80)}...")
         if pose.get('attire'):
-            print(f"   Attire: {pose['attire'][:80]}...")
-        print()
+            lines.append(f"   Attire: {pose['attire'][:80]}...")
+        lines.append("")
 
-    print("=" * 60)
+    lines.append(SEPARATOR)
+    _write_lines(lines)
     return 0
 
 def command_list_templates(args):
@@ -598,59 +618,68 @@ def command_list_templates(args):
         print("❌ No templates found for family scenario.")
         return 1
 
-    print("\n" + "=" * 60)
-    print("👨‍👩‍👧‍👦 Available Family Templates")
-    print("=" * 60)
+    if args.json:
+        _write_json(templates)
+        return 0
 
-    print(f"\nTotal: {len(templates)} templates\n")
+    lines = [
+        SEPARATOR_NL,
+        "👨‍👩‍👧‍👦 Available Family Templates",
+        SEPARATOR,
+        f"\nTotal: {len(templates)} templates\n",
+    ]
 
     for i, template in enumerate(templates, 1):
-        print(f"{i}. {template['name']}")
-        print(f"   ID: {template.get('id', 'N/A')}")
-        print(f"   Prompt: {template.get('prompt', '')[:80]}...")
-        print(f"   Scene: {template.get('scene', '')[:80]}...")
-        print(f"   Atmosphere: {template.get('atmosphere', '')[:80]}...")
-        print(f"   Person Count: {template.get('person_count', 'N/A')}")
+        lines.append(f"{i}. {template['name']}")
+        lines.append(f"   ID: {template.get('id', 'N/A')}")
+        lines.append(f"   Prompt: {_trunc(template, 'prompt', 80)}...")
+        lines.append(f"   Scene: {_trunc(template, 'scene', 80)}...")
+        lines.append(f"   Atmosphere: {_trunc(template, 'atmosphere', 80)}...")
+        lines.append(f"   Person Count: {template.get('person_count', 'N/A')}")
         if template.get('attire'):
-            print(f"   Attire: {template['attire'][:80]}...")
-        print()
+            lines.append(f"   Attire: {template['attire'][:80]}...")
+        lines.append("")
 
-    print("=" * 60)
+    lines.append(SEPARATOR)
+    _write_lines(lines)
     return 0
 
+def _character_lines(lines, characters):
+    """Append the numbered name/prompt/scene block for each character"""
+    for i, char in enumerate(characters, 1):
+        lines.append(f"  {i}. {char['name']}")
+        lines.append(f"     Prompt: {char['prompt'][:80]}...")
+        if char.get('scene'):
+            lines.append(f"     Scene: {char['scene'][:80]}...")
+        lines.append("")
+
 def command_list_characters(args):
     """Handle list-characters command"""
     characters = config.get_characters()
+    if args.json:
+        _write_json(characters)
+        return 0
+
     custom_chars = config.config["characters"]
 
-    print("🎭 Available Movie Characters")
-    print("=" * 60)
+    lines = ["🎭 Available Movie Characters", SEPARATOR]
 
     if custom_chars:
-        print("\n📝 Custom Characters:")
-        for i, char in enumerate(custom_chars, 1):
-            print(f"  {i}. {char['name']}")
-            print(f"     Prompt: {char['prompt'][:80]}...")
-            if char.get('scene'):
-                print(f"     Scene: {char['scene'][:80]}...")
-            print()
-
-    print("\n🌟 Default Characters:")
+        lines.append("\n📝 Custom Characters:")
+        _character_lines(lines, custom_chars)
+
+    lines.append("\n🌟 Default Characters:")
     default_chars = [c for c in characters if c not in custom_chars]
-    for i, char in enumerate(default_chars, 1):
-        print(f"  {i}. {char['name']}")
-        print(f"     Prompt: {char['prompt'][:80]}...")
-        if char.get('scene'):
-            print(f"     Scene: {char['scene'][:80]}...")
-        print()
+    _character_lines(lines, default_chars)
 
-    print(f"Total: {len(characters)} characters")
+    lines.append(f"Total: {len(characters)} characters")
+    _write_lines(lines)
     return 0
 
 def command_add_character(args):
     """Handle add-character command"""
     print("➕ Adding Custom Character")
-    print("=" * 60)
+    print(SEPARATOR)
 
     character = config.add_character(args.name, args.prompt, args.scene)
 
@@ -665,7 +694,7 @@ def command_config(args):
     """Handle config command"""
     if args.show:
         print("⚙️ Current Configuration")
-        print("=" * 60)
+        print(SEPARATOR)
         print(json.dumps(config.config, indent=2, ensure_ascii=False))
     elif args.set:
         try:
@@ -687,26 +716,48 @@ def command_cleanup(args):
     """Handle cleanup command"""
     print("🧹 Cleaning up temporary files...")
     temp_dir = Path(config.config["paths"]["temp_dir"])
-    if temp_dir.exists():
-        for item in temp_dir.iterdir():
+    try:
+        entries = os.scandir(temp_dir)
+    except FileNotFoundError:
+        print("⚠️ Temp directory does not exist")
+        return 0
+
+    # DirEntry caches the file type from readdir, so no extra stat per entry
+    with entries:
+        for entry in entries:
             try:
-                if item.is_file():
-                    item.unlink()
-                elif item.is_dir():
-                    import shutil
-                    shutil.rmtree(item)
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
             except Exception as e:
-                print(f"⚠️ Could not delete {item}: {e}")
-        print(f"✅ Cleaned up {temp_dir}")
-    else:
-        print("⚠️ Temp directory does not exist")
+                print(f"⚠️ Could not delete {entry.path}: {e}")
+    print(f"✅ Cleaned up {temp_dir}")
     return 0
 
+# Command handlers keyed by subcommand name
+COMMANDS = {
+    "generate": command_generate,
+    "list-scenarios": command_list_scenarios,
+    "list-styles": command_list_styles,
+    "list-poses": command_list_poses,
+    "list-templates": command_list_templates,
+    "list-backgrounds": command_list_backgrounds,
+    "list-characters": command_list_characters,
+    "add-character": command_add_character,
+    "config": command_config,
+    "cleanup": command_cleanup,
+}
+
 def main():
     """Main entry point"""
-    parser = setup_argparse()
+    first_positional = next((a for a in sys.argv[1:] if not a.startswith('-')), None)
+    parser = setup_argparse(first_positional)
     args, unknown_args = parser.parse_known_args()
 
+    # Generation banners/summaries are logged at INFO; --quiet drops them
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING if args.quiet else logging.INFO)
+
     if not args.command:
         parser.print_help()
         return 1
@@ -724,40 +775,19 @@ def main():
     args.template_fields = template_fields
 
     try:
-        if args.command == "generate":
-            return command_generate(args)
-        elif args.command == "list-scenarios":
-            return command_list_scenarios(args)
-        elif args.command == "list-styles":
-            return command_list_styles(args)
-        elif args.command == "list-poses":
-            return command_list_poses(args)
-        elif args.command == "list-templates":
-            return command_list_templates(args)
-        elif args.command == "list-backgrounds":
-            return command_list_backgrounds(args)
-        elif args.command == "list-characters":
-            return command_list_characters(args)
-        elif args.command == "add-character":
-            return command_add_character(args)
-        elif args.command == "config":
-            return command_config(args)
-        elif args.command == "cleanup":
-            return command_cleanup(args)
-        else:
+        handler = COMMANDS.get(args.command)
+        if handler is None:
             print(f"❌ Unknown command: {args.command}")
             return 1
+        return handler(args)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled by user")
         return 130
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
-        import traceback
         traceback.print_exc()
         return 1
 
 if __name__ == "__main__":
-    # Import json here to avoid circular imports
-    import json
     sys.exit(main())
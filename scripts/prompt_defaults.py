@@ -0,0 +1,48 @@
+"""
+Built-in prompt and banner text shared by the CLI, the template wizard previews
+and the image generator
+"""
+
+from functools import lru_cache
+
+# Package logger for generation banners and summaries (INFO); --quiet raises it to WARNING
+LOGGER_NAME = "photo_studio"
+
+# Pre-built banner separators shared by every command and wizard screen
+SEPARATOR = "=" * 60
+SEPARATOR_NL = "\n" + SEPARATOR
+SUB_SEPARATOR = "-" * 40
+
+# Built-in descriptions for the series templates (seasons, character-states, story-sequence)
+SERIES_SEASONS = (
+    ("春天", "嫩绿新叶，粉红花朵，柔和晨光，生机勃勃"),
+    ("夏天", "翠绿浓荫，金色阳光，强烈日光，热情洋溢"),
+    ("秋天", "橙红落叶，金黄果实，温暖黄昏，丰收喜悦"),
+    ("冬天", "银白雪地，深蓝天空，冷清冬阳，静谧纯净")
+)
+SERIES_DEFAULT_STATES = {
+    "动作状态": ("奔跑", "跳跃", "静止", "转身"),
+    "表情状态": ("开心", "惊讶", "思考", "平静"),
+    "服装变化": ("日常装", "运动装", "正式装", "休闲装"),
+    "道具互动": ("手持相机", "抱着玩偶", "拿着书本", "背着背包")
+}
+SERIES_STORY_STAGES = (
+    "故事开端，介绍主角和初始环境",
+    "发展情节，主角面临挑战或机会",
+    "情节升级，主角采取行动或做出选择",
+    "高潮时刻，关键冲突或转折点",
+    "解决阶段，主角克服困难或达成目标",
+    "结局，展示结果和成长"
+)
+
+# Placeholder values every template prompt can rely on
+PHOTO_REFERENCE_DEFAULTS = {"原照片的": "参考"}
+
+
+@lru_cache(maxsize=16)
+def fusion_person_instructions(photo_count: int) -> str:
+    """Per-person identification instructions for a fusion prompt with photo_count photos"""
+    return " ".join(
+        f"Person {j+1}: Extract facial features, gender, age, and appearance from reference photo #{j+1} only."
+        for j in range(photo_count)
+    )
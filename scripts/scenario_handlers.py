@@ -4,88 +4,143 @@ Scenario handlers for main.py
 Extracted to reduce command_generate function complexity
 """
 
+import os
+import re
 import sys
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from gen_cache import GenerationCache
 
 
 def validate_photo_path(photo_path: Optional[str]) -> Tuple[bool, str]:
     """Validate single photo path exists"""
-    if not photo_path or not Path(photo_path).exists():
+    if not photo_path or not os.path.exists(photo_path):
         return False, f"❌ Photo not found: {photo_path}"
     return True, ""
 
 
-def validate_photo_paths(photos_arg: Optional[str], min_count: int = 1, max_count: int = 14) -> Tuple[bool, str, List[str]]:
+# Comma plus any surrounding whitespace, so split() yields stripped values
+_CSV_SEPARATOR = re.compile(r'\s*,\s*')
+
+
+def parse_csv(arg: str) -> Tuple[str, ...]:
+    """Split a comma-separated argument into stripped values"""
+    if ',' not in arg:
+        return (arg.strip(),)
+    return tuple(_CSV_SEPARATOR.split(arg.strip()))
+
+
+def validate_photo_paths(photos_arg: Optional[str], min_count: int = 1, max_count: int = 14) -> Tuple[bool, str, Tuple[str, ...]]:
     """Validate and parse comma-separated photo paths"""
     if not photos_arg:
-        return False, "❌ --photos parameter is required.", []
+        return False, "❌ --photos parameter is required.", ()
     
-    photo_paths = [p.strip() for p in photos_arg.split(',')]
+    photo_paths = parse_csv(photos_arg)
     if len(photo_paths) < min_count:
-        return False, f"❌ At least {min_count} photo(s) required.", []
+        return False, f"❌ At least {min_count} photo(s) required.", ()
     if len(photo_paths) > max_count:
         return False, f"⚠️ Maximum {max_count} photos allowed, using first {max_count}", photo_paths[:max_count]
 
-    for p in photo_paths:
-        if not Path(p).exists():
-            return False, f"❌ Photo not found: {p}", []
+    missing = next((p for p in photo_paths if not os.path.isfile(p)), None)
+    if missing is not None:
+        return False, f"❌ Photo not found: {missing}", ()
     
     return True, "", photo_paths
 
 
-def find_item_by_name_or_id(items: List[Dict], name: str, item_type: str = "item") -> Tuple[Optional[Dict], str]:
-    """Find item by name or id in list"""
-    for item in items:
-        if item.get('name') == name or item.get('id') == name:
-            return item, ""
+def find_item_by_name_or_id(index: Dict[str, Dict], name: str, item_type: str = "item") -> Tuple[Optional[Dict], str]:
+    """Find item by name or id in an index built by config.get_*_index"""
+    item = index.get(name)
+    if item is not None:
+        return item, ""
     return None, f"❌ {item_type.capitalize()} '{name}' not found."
 
 
+def print_available_items(items: List[Dict], item_type: str, limit: int = 5) -> None:
+    """Print the first few item names as a hint after a failed selection"""
+    lines = [f"Available {item_type}s:"]
+    lines.extend(f"  - {item['name']}" for item in items[:limit])
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def resolve_item(index: Dict[str, Dict], items: List[Dict], name: str, item_type: str) -> Optional[Dict]:
+    """Find item by name or id; on a miss print the error and the available items"""
+    item, error = find_item_by_name_or_id(index, name, item_type)
+    if item is None:
+        print(error)
+        print_available_items(items, item_type)
+    return item
+
+
 def get_count_with_default(args, default: int = 1) -> int:
     """Get count from args with fallback to default"""
-    return getattr(args, 'count', default) or default
+    return args.count or default
+
+
+def _is_enabled(value) -> bool:
+    """Interpret a config flag; `config --set` stores values as strings"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def cached_generate(config, scenario_id: str, photos: Sequence[Optional[str]], params: Dict,
+                    generate: Callable[[], List[str]]) -> List[str]:
+    """
+    Run generate(), reusing earlier output for identical photos and parameters
+    when generation.reuse_results is enabled
+    """
+    if not _is_enabled(config.config.get("generation", {}).get("reuse_results", False)):
+        return generate() or []
+
+    cache = GenerationCache(config.get_output_dir())
+    key = cache.key([p for p in photos if p], scenario_id, params)
+    cached = cache.hit(key)
+    if cached:
+        print(f"♻️ Reusing {len(cached)} cached image(s) for identical input")
+        return cached
+
+    result = generate() or []
+    if result and all(result):
+        cache.store(key, result)
+    return result
 
 
 def handle_portrait_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle portrait scenario"""
-    photo_path = getattr(args, 'photo', None)
+    photo_path = args.photo
     valid, error = validate_photo_path(photo_path)
     if not valid:
         print(error)
         return False, []
 
-    style_name = getattr(args, 'style', None)
+    styles = config.get_scenario_data('portrait')
+
+    style_name = args.style
     if not style_name:
         print("❌ Style is required for portrait scenario. Use --style parameter.")
-        print("Available styles:")
-        styles = config.get_scenario_data('portrait')
-        if styles:
-            for s in styles[:5]:
-                print(f"  - {s['name']}")
+        print_available_items(styles or [], "style")
         return False, []
 
-    styles = config.get_scenario_data('portrait')
     if not styles:
         print("❌ Failed to load portrait styles.")
         return False, []
 
-    selected_style, error = find_item_by_name_or_id(styles, style_name, "style")
+    selected_style = resolve_item(config.get_scenario_index('portrait'), styles, style_name, "style")
     if not selected_style:
-        print(error)
-        print("Available styles:")
-        for s in styles[:5]:
-            print(f"  - {s['name']}")
         return False, []
 
     count = get_count_with_default(args, 1)
-    result = image_gen.generate_portrait_images(photo_path, [selected_style], count)
-    return True, result if result else []
+    result = cached_generate(
+        config, 'portrait', [photo_path], {"style": selected_style, "count": count},
+        lambda: image_gen.generate_portrait_images(photo_path, [selected_style], count)
+    )
+    return True, result
 
 
 def handle_couple_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle couple scenario"""
-    photos_arg = getattr(args, 'photos', None)
+    photos_arg = args.photos
     valid, error, photo_paths = validate_photo_paths(photos_arg, min_count=2)
     if not valid:
         print(error)
@@ -98,41 +153,33 @@ def handle_couple_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
         print("❌ Failed to load couple poses.")
         return False, []
 
-    pose_name = getattr(args, 'pose', None)
+    pose_name = args.pose
     if pose_name:
-        selected_pose, error = find_item_by_name_or_id(couple_poses, pose_name, "pose")
+        selected_pose = resolve_item(config.get_scenario_index('couple'), couple_poses, pose_name, "pose")
         if not selected_pose:
-            print(error)
-            print("Available poses:")
-            for p in couple_poses[:5]:
-                print(f"  - {p['name']}")
             return False, []
     else:
         selected_pose = couple_poses[0]
 
     background = None
-    background_name = getattr(args, 'background', None)
+    background_name = args.background
     if background_name:
         backgrounds = config.get_backgrounds('couple')
         if backgrounds:
-            for bg in backgrounds:
-                if bg['name'] == background_name or bg.get('id') == background_name:
-                    background = bg
-                    break
+            background = resolve_item(config.get_backgrounds_index('couple'), backgrounds, background_name, "background")
             if not background:
-                print(f"❌ Background '{background_name}' not found.")
-                print("Available backgrounds:")
-                for b in backgrounds[:5]:
-                    print(f"  - {b['name']}")
                 return False, []
 
-    result = image_gen.generate_couple_images(photo_paths, selected_pose, count, background)
-    return True, result if result else []
+    result = cached_generate(
+        config, 'couple', photo_paths, {"pose": selected_pose, "count": count, "background": background},
+        lambda: image_gen.generate_couple_images(photo_paths, selected_pose, count, background)
+    )
+    return True, result
 
 
 def handle_family_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle family scenario"""
-    photos_arg = getattr(args, 'photos', None)
+    photos_arg = args.photos
     valid, error, photo_paths = validate_photo_paths(photos_arg, min_count=1, max_count=6)
     if not valid:
         print(error)
@@ -145,43 +192,35 @@ def handle_family_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
         print("❌ Failed to load family templates.")
         return False, []
 
-    template_name = getattr(args, 'template', None)
+    template_name = args.template
     if template_name:
-        selected_template, error = find_item_by_name_or_id(family_templates, template_name, "template")
+        selected_template = resolve_item(config.get_scenario_index('family'), family_templates, template_name, "template")
         if not selected_template:
-            print(error)
-            print("Available templates:")
-            for t in family_templates[:5]:
-                print(f"  - {t['name']}")
             return False, []
     else:
         selected_template = family_templates[0]
 
     background = None
-    background_name = getattr(args, 'background', None)
+    background_name = args.background
     if background_name:
         backgrounds = config.get_backgrounds('family')
         if backgrounds:
-            for bg in backgrounds:
-                if bg['name'] == background_name or bg.get('id') == background_name:
-                    background = bg
-                    break
+            background = resolve_item(config.get_backgrounds_index('family'), backgrounds, background_name, "background")
             if not background:
-                print(f"❌ Background '{background_name}' not found.")
-                print("Available backgrounds:")
-                for b in backgrounds[:5]:
-                    print(f"  - {b['name']}")
                 return False, []
 
-    result = image_gen.generate_family_images(
-        photo_paths, len(photo_paths), count, selected_template, background
+    result = cached_generate(
+        config, 'family', photo_paths, {"template": selected_template, "count": count, "background": background},
+        lambda: image_gen.generate_family_images(
+            photo_paths, len(photo_paths), count, selected_template, background
+        )
     )
-    return True, result if result else []
+    return True, result
 
 
 def handle_free_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle free mode scenario"""
-    photos_arg = getattr(args, 'photos', None)
+    photos_arg = args.photos
     photo_paths = None
 
     if photos_arg:
@@ -189,7 +228,7 @@ def handle_free_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
         if not valid:
             print(error)
             return False, []
-    elif hasattr(args, 'photo') and args.photo:
+    elif args.photo:
         valid, error = validate_photo_path(args.photo)
         if not valid:
             print(error)
@@ -199,21 +238,25 @@ def handle_free_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
         print("❌ --photos or --photo parameter is required for free mode.")
         return False, []
 
-    custom_prompt = getattr(args, 'prompt', None)
+    custom_prompt = args.prompt
     if not custom_prompt:
         print("❌ --prompt parameter is required for free mode.")
         return False, []
 
     count = get_count_with_default(args, 1)
-    negative_prompt = getattr(args, 'negative_prompt', "")
+    negative_prompt = args.negative_prompt
 
-    result = image_gen.generate_free_mode_images(photo_paths, custom_prompt, count, negative_prompt)
-    return True, result if result else []
+    result = cached_generate(
+        config, 'free', photo_paths,
+        {"prompt": custom_prompt, "count": count, "negative_prompt": negative_prompt},
+        lambda: image_gen.generate_free_mode_images(photo_paths, custom_prompt, count, negative_prompt)
+    )
+    return True, result
 
 
 def handle_edit_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle edit scenario"""
-    photo_path = getattr(args, 'photo', None)
+    photo_path = args.photo
     valid, error = validate_photo_path(photo_path)
     if not valid:
         print(error)
@@ -224,7 +267,7 @@ def handle_edit_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
 
 def handle_fusion_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle fusion scenario"""
-    photos_arg = getattr(args, 'photos', None)
+    photos_arg = args.photos
     if not photos_arg:
         print("❌ --photos parameter is required for fusion scenario.")
         return False, []
@@ -239,7 +282,7 @@ def handle_fusion_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
 
 def handle_series_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle series scenario"""
-    photo_path = getattr(args, 'photo', None)
+    photo_path = args.photo
     valid, error = validate_photo_path(photo_path)
     if not valid:
         print(error)
@@ -250,7 +293,7 @@ def handle_series_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
 
 def handle_poster_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle poster scenario"""
-    photo_path = getattr(args, 'photo', None)
+    photo_path = args.photo
     if photo_path:
         valid, error = validate_photo_path(photo_path)
         if not valid:
@@ -260,22 +303,56 @@ def handle_poster_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     return handle_template_based_common(args, config, image_gen, 'poster', photo_path, None)
 
 
+# Template scenarios: id -> (ImageGenerator method, whether it takes the photo list)
+_TEMPLATE_GENERATORS = {
+    'edit': ('generate_edit_images', False),
+    'fusion': ('generate_fusion_images', True),
+    'series': ('generate_series_images', False),
+    'poster': ('generate_poster_images', False),
+}
+
+
+# id(template) -> (template, field specs); holding the template keeps its id from being reused
+_field_specs_cache = {}
+
+
+def _template_field_specs(template: Dict) -> Tuple[Tuple[str, bool, Optional[str]], ...]:
+    """
+    Return (name, is_multiselect, fallback) for each template field, computed once per template.
+    fallback is the default value, "" for optional fields, or None when the field is required.
+    """
+    cached = _field_specs_cache.get(id(template))
+    if cached is None:
+        specs = []
+        for field in template.get('fields', []):
+            if field.get('default'):
+                fallback = field['default']
+            elif not field.get('required', False):
+                fallback = ""
+            else:
+                fallback = None
+            specs.append((field['name'], field['type'] == 'multiselect', fallback))
+        cached = _field_specs_cache[id(template)] = (template, tuple(specs))
+    return cached[1]
+
+
 def handle_template_based_common(args, config, image_gen, scenario_id: str, 
                                 photo_path: Optional[str], photo_paths: Optional[List[str]]) -> Tuple[bool, List[str]]:
     """Common handler for template-based scenarios (edit, fusion, series, poster)"""
+    generator = _TEMPLATE_GENERATORS.get(scenario_id)
+    if generator is None:
+        return False, []
+    method, takes_photo_list = generator
+
     templates = config.get_scenario_data(scenario_id)
     if not templates:
         print(f"❌ Failed to load {scenario_id} templates")
         return False, []
 
-    template_name = getattr(args, 'template', None)
+    template_name = args.template
     if template_name:
-        selected_template, error = find_item_by_name_or_id(templates, template_name, "template")
+        selected_template = resolve_item(config.get_scenario_index(scenario_id), templates, template_name, "template")
         if not selected_template:
-            print(error)
-            print("Available templates:")
-            for t in templates[:5]:
-                print(f"  - {t['name']}")
             return False, []
     else:
         selected_template = templates[0] if templates else None
@@ -285,44 +362,34 @@ def handle_template_based_common(args, config, image_gen, scenario_id: str,
         return False, []
 
     field_values = {}
-    template_fields = selected_template.get('fields', [])
-
-    for field in template_fields:
-        field_name = field['name']
-        
-        value = None
-        
-        if hasattr(args, 'template_fields') and field_name in args.template_fields:
-            value = args.template_fields[field_name]
-        elif hasattr(args, field_name):
-            value = getattr(args, field_name)
-        
+    cli_fields = args.template_fields
+    arg_values = vars(args)
+
+    for field_name, is_multiselect, fallback in _template_field_specs(selected_template):
+        # Unknown --field options first, then declared generate arguments
+        value = cli_fields.get(field_name)
+        if value is None:
+            value = arg_values.get(field_name)
+
         if value is not None:
-            if field['type'] == 'multiselect' and isinstance(value, str):
+            if is_multiselect and isinstance(value, str):
                 value = value.replace(',', ', ')
             field_values[field_name] = value
-        elif field.get('default'):
-            field_values[field_name] = field['default']
-        elif not field.get('required', False):
-            field_values[field_name] = ""
-
-    if scenario_id == 'edit':
-        result = image_gen.generate_edit_images(photo_path, selected_template, field_values)
-    elif scenario_id == 'fusion':
-        result = image_gen.generate_fusion_images(photo_paths, selected_template, field_values)
-    elif scenario_id == 'series':
-        result = image_gen.generate_series_images(photo_path, selected_template, field_values)
-    elif scenario_id == 'poster':
-        result = image_gen.generate_poster_images(photo_path, selected_template, field_values)
-    else:
-        return False, []
-
-    return True, result if result else []
+        elif fallback is not None:
+            field_values[field_name] = fallback
+
+    photos = photo_paths if takes_photo_list else photo_path
+    result = cached_generate(
+        config, scenario_id, photo_paths if takes_photo_list else [photo_path],
+        {"template": selected_template, "fields": field_values},
+        lambda: getattr(image_gen, method)(photos, selected_template, field_values)
+    )
+    return True, result
 
 
 def handle_celebrity_scenario(args, config, image_gen) -> Tuple[bool, List[str]]:
     """Handle celebrity scenario"""
-    photo_path = getattr(args, 'photo', None)
+    photo_path = args.photo
     valid, error = validate_photo_path(photo_path)
     if not valid:
         print(error)
@@ -330,25 +397,33 @@ def handle_celebrity_scenario(args, config, image_gen) -> Tuple[bool, List[str]]
 
     all_chars = config.get_characters()
 
-    if hasattr(args, 'characters') and args.characters:
-        selected_chars = []
-        char_names = [c.strip() for c in args.characters.split(',')]
+    if args.characters:
+        # Custom characters come first, so they win over a default with the same name
+        name_to_char = {}
         for char in all_chars:
-            if char['name'] in char_names:
-                selected_chars.append(char)
-        characters_to_generate = selected_chars
+            name_to_char.setdefault(char['name'], char)
+        requested = dict.fromkeys(parse_csv(args.characters))
+        characters_to_generate = [name_to_char[name] for name in requested if name in name_to_char]
     else:
-        default_count = config.config["generation"]["default_image_count"]
-        count = getattr(args, 'count', default_count)
+        count = args.count or config.config.get("generation", {}).get("default_image_count", 1)
         characters_to_generate = all_chars[:count]
 
-    generated_images = []
-    for i, character in enumerate(characters_to_generate):
-        print(f"\nGenerating image {i+1}/{len(characters_to_generate)}: {character['name']}")
-
-        image_path = image_gen.generate_single_image(photo_path, character, i)
-
-        if image_path:
-            generated_images.append(image_path)
-
-    return True, generated_images
+    results = cached_generate(
+        config, 'celebrity', [photo_path], {"characters": characters_to_generate},
+        lambda: image_gen.generate_character_images(photo_path, characters_to_generate)
+    )
+    return True, [path for path in results if path]
+
+
+# Non-interactive handlers keyed by scenario id; anything else is celebrity
+SCENARIO_HANDLERS = {
+    'portrait': handle_portrait_scenario,
+    'couple': handle_couple_scenario,
+    'family': handle_family_scenario,
+    'free': handle_free_scenario,
+    'edit': handle_edit_scenario,
+    'fusion': handle_fusion_scenario,
+    'series': handle_series_scenario,
+    'poster': handle_poster_scenario,
+    'celebrity': handle_celebrity_scenario,
+}
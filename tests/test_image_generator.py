@@ -0,0 +1,55 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import image_generator  # noqa: E402
+from image_generator import ImageGenerator  # noqa: E402
+
+
+class _Interaction:
+    current_state = {}
+
+    def show_progress(self, step, current, total):
+        pass
+
+
+def _make_generator(tmp_path, max_concurrent):
+    config = SimpleNamespace(
+        config={
+            "api": {"image_generation_url": "http://localhost/unused"},
+            "paths": {"output_dir": str(tmp_path)},
+            "generation": {"max_concurrent": max_concurrent},
+            "mock": {"enabled": True},
+        },
+        get_api_key=lambda: "test",
+    )
+    return ImageGenerator(config, _Interaction())
+
+
+def test_character_request_starts_stay_spaced_when_workers_are_backlogged(tmp_path, monkeypatch):
+    interval = 0.1
+    monkeypatch.setattr(image_generator, "REQUEST_INTERVAL", interval)
+    gen = _make_generator(tmp_path, max_concurrent=4)
+
+    starts = []
+    release_at = time.monotonic() + interval * 6
+
+    def fake_single_image(user_photo_path, character, index, show_progress=True):
+        starts.append(time.monotonic())
+        # The first batch occupies every worker and frees them all at the same moment
+        if index < 4:
+            time.sleep(max(0.0, release_at - time.monotonic()))
+        return f"{character['name']}.jpg"
+
+    gen.generate_single_image = fake_single_image
+    characters = [{"name": f"c{i}"} for i in range(8)]
+
+    results = gen.generate_character_images("photo.jpg", characters)
+
+    assert results == [f"c{i}.jpg" for i in range(8)]
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= interval * 0.9, gaps